@@ -9,6 +9,9 @@
 # - pymongo (Database)
 # - requests (HTTP calls to OSRM)
 # - math (for Haversine formula as fallback)
+# - numpy (vectorized Haversine for nearest-station ranking)
+# - pyahocorasick (optional, single-pass keyword classification)
+# - orjson (optional, faster OSRM response parsing)
 #
 # Data Contract (MongoDB):
 # - Input Collection: 'reports'
@@ -17,29 +20,113 @@
 #   - Document Structure: { 'routes': [[lat, lng], ...], 'vehicle_id': int, 'timestamp': datetime }
 #
 # Logic Flow (Infinite Loop):
-# 1. Poll MongoDB every 5 seconds.
+# 1. Poll MongoDB every 5 seconds (adaptive: faster after activity, slower when idle).
+#    On replica sets a change stream wakes the loop as soon as new work arrives.
 # 2. Query: Find all reports where 'severity' > 8 AND 'dispatch_status' == 'Unassigned'.
 # 3. For each report/need:
 #    - Determine the appropriate station type (police, hospital, fire, rescue)
-#    - Find the nearest station of that type
-#    - Call OSRM to get road-snapped route geometry
+#    - Find the nearest station of that type (by road duration via OSRM /table,
+#      falling back to Haversine distance)
+#    - Call OSRM to get road-snapped route geometry (all of a cycle's routes concurrently)
 # 4. Atomic Update:
-#    - Insert a new document into 'missions' collection with the generated routes.
+#    - Items are claimed ('Processing') when queried, so no other agent dispatches them.
+#    - Insert all of the cycle's new 'missions' documents in one batch.
 #    - Update all processed reports: Set 'dispatch_status' = 'Assigned' (to prevent re-routing).
 # 5. Logging: Print clear updates like "[Logistics] 🚚 Processing...", "[Logistics] 🗺️ Route generated."
+#    (via the 'logistics' logger; LOGISTICS_LOG_LEVEL=DEBUG adds keyword-matching details)
 
+import atexit
+import logging
+import logging.handlers
 import os
+import queue
+import re
+import sys
+import threading
 import time
 import math
+import numbers
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
 import requests
-from datetime import datetime, timezone
-from pymongo import MongoClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from pymongo import MongoClient, UpdateMany
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
+
+try:
+    import ahocorasick  # Optional: single-pass keyword matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # Optional: faster parsing of large OSRM responses
+except ImportError:
+    orjson = None
+
+# Logging — records go to stdout because the backend relays agent stderr as
+# errors. A dedicated variable is used so the backend's LOG_LEVEL (default
+# "warn") does not silence the agent's normal progress output.
+LOG_LEVEL = os.environ.get("LOGISTICS_LOG_LEVEL", "INFO").upper()
+logger = logging.getLogger("logistics")
 
 # OSRM Configuration — set OSRM_BASE_URL to a self-hosted instance for production
 # The public demo server (router.project-osrm.org) has strict rate limits but
 # exposes the standard OSRM HTTP API at the root path.
 OSRM_BASE_URL = os.environ.get("OSRM_BASE_URL", "https://router.project-osrm.org")
-OSRM_TIMEOUT = 10  # seconds
+# Separate connect/read timeouts so an unreachable OSRM host fails fast
+# instead of stalling each dispatch for the full read timeout.
+OSRM_CONNECT_TIMEOUT = float(os.environ.get("OSRM_CONNECT_TIMEOUT", 3))  # seconds
+OSRM_TIMEOUT = float(os.environ.get("OSRM_TIMEOUT", 10))  # seconds
+# Concurrent OSRM requests per poll cycle (route fetches are I/O-bound)
+OSRM_MAX_WORKERS = int(os.environ.get("OSRM_MAX_WORKERS", 16))
+# Station selection by road duration via the /table service: the nearest
+# candidates by Haversine per incident are re-ranked with one matrix call.
+# The public demo server caps a table at 100 coordinates.
+OSRM_TABLE_CANDIDATES = int(os.environ.get("OSRM_TABLE_CANDIDATES", 5))
+OSRM_TABLE_MAX_COORDS = int(os.environ.get("OSRM_TABLE_MAX_COORDS", 100))
+# Route geometry encoding requested from OSRM. polyline6 is ~4x smaller than
+# GeoJSON on the wire and is decoded here, so missions still store
+# [[lat, lng], ...]; set to "geojson" to fall back to the raw coordinates.
+OSRM_GEOMETRY_FORMAT = os.environ.get("OSRM_GEOMETRY_FORMAT", "polyline6").lower()
+# Set NEED_ROUTE_GEOMETRY=false when only road distance/duration are needed:
+# the per-mission /route call is skipped when /table already measured the
+# road, and otherwise made without geometry. Missions then store a straight
+# station -> incident line with the road metrics.
+NEED_ROUTE_GEOMETRY = os.environ.get("NEED_ROUTE_GEOMETRY", "true").lower() in {"1", "true", "yes"}
+
+# Shared HTTP session so OSRM calls reuse pooled keep-alive connections
+# instead of paying a TCP/TLS handshake per route. The pool is sized for
+# the concurrent route fetches; transient gateway errors are retried.
+_osrm_session = requests.Session()
+_osrm_adapter = HTTPAdapter(
+    pool_connections=OSRM_MAX_WORKERS,
+    pool_maxsize=OSRM_MAX_WORKERS * 2,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET"],
+    ),
+)
+_osrm_session.mount("https://", _osrm_adapter)
+_osrm_session.mount("http://", _osrm_adapter)
+_osrm_session.headers.update({"Connection": "keep-alive"})
+
+# Route cache keyed on endpoints rounded to 4 decimals (~11 m), so clustered
+# reports and reroutes from the same station skip the OSRM round-trip.
+# Entries expire so road closures eventually show up in new routes.
+OSRM_ROUTE_CACHE_SIZE = int(os.environ.get("OSRM_ROUTE_CACHE_SIZE", 4096))
+OSRM_ROUTE_CACHE_TTL = float(os.environ.get("OSRM_ROUTE_CACHE_TTL", 3600))  # seconds
+_route_cache = OrderedDict()  # key -> (expires_at, route)
+_route_cache_lock = threading.Lock()
+# Mongo collection backing the route cache across restarts (see
+# enable_route_cache_store); None keeps the cache in memory only
+_route_cache_store = None
 
 # MongoDB Connection Configuration
 MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/DisasterResponseDB")
@@ -47,12 +134,47 @@ DATABASE_NAME = os.environ.get("DATABASE_NAME", "DisasterResponseDB")
 REPORTS_COLLECTION = "reports"
 NEEDS_COLLECTION = "needs"
 MISSIONS_COLLECTION = "missions"
+ROUTE_CACHE_COLLECTION = "route_cache"
 
 # Agent Configuration
 POLL_INTERVAL_SECONDS = 5
+MIN_POLL_INTERVAL_SECONDS = 1  # Floor after cycles that dispatched missions
+# Ceiling while idle (interval doubles per idle cycle). Only used while the
+# change stream is open to wake the loop early; when polling alone the idle
+# interval stays at POLL_INTERVAL_SECONDS so new reports are not delayed.
+MAX_POLL_INTERVAL_SECONDS = int(os.environ.get("LOGISTICS_MAX_POLL_INTERVAL", 60))
+CHANGE_STREAM_RETRY_SECONDS = 5  # Delay before reopening a failed change stream
 MIN_CLUSTER_SIZE = 1  # Process every single report immediately (hackathon demo)
 NUM_VEHICLES = 1  # Single vehicle for individual reports
 SEVERITY_THRESHOLD = 0  # Accept all severity levels
+# Reports/needs are claimed ('Processing') before dispatch so a second agent
+# cannot pick up the same items; claims older than this are taken over
+# (e.g. after a crash mid-cycle)
+CLAIM_TIMEOUT_SECONDS = 300
+
+# Projections for the dispatch queries — only the fields used for station
+# selection and routing, so large fields (media, transcripts) are not decoded
+REPORT_PROJECTION = {
+    '_id': 1,
+    'reportId': 1,
+    'location': 1,
+    'text': 1,
+    'sentinelData.tag': 1,
+    'oracleData.needs': 1,
+    'rerouted_to_station': 1,
+    'assignedStation': 1,
+    'assigned_station': 1,
+}
+NEED_PROJECTION = {
+    '_id': 1,
+    'coordinates': 1,
+    'rawMessage': 1,
+    'triageData.needType': 1,
+    'triageData.details': 1,
+    'rerouted_to_station': 1,
+    'assignedStation': 1,
+    'assigned_station': 1,
+}
 
 # Collection for registered emergency stations
 STATIONS_COLLECTION = "emergencystations"
@@ -60,7 +182,19 @@ STATIONS_COLLECTION = "emergencystations"
 # Cache for stations (refreshed periodically)
 _stations_cache = {}
 _stations_cache_time = 0
+# Per-type coordinate arrays derived from _stations_cache, rebuilt only when
+# the cache refreshes: {type: (stations_with_coords, lats, lons)}
+_stations_arrays = {}
 STATIONS_CACHE_TTL = 60  # Refresh station cache every 60 seconds
+# Only the fields the agent reads when (re)building the station cache
+STATION_PROJECTION = {
+    '_id': 1,
+    'name': 1,
+    'type': 1,
+    'stationId': 1,
+    'location.lat': 1,
+    'location.lng': 1,
+}
 
 # Mapping of need types/tags to resource station types (ordered by priority)
 # More specific keywords should be checked first
@@ -120,6 +254,34 @@ DEFAULT_DEPOT = {
 }
 
 
+def configure_logging():
+    """
+    Send agent log records to stdout with the [Logistics] prefix.
+    
+    Records are handed to a queue and written by a background listener
+    thread, so the dispatch loop never blocks on the stdout write/flush.
+    The listener is stopped (and the queue drained) at interpreter exit.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[Logistics] %(message)s"))
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    
+    # getLevelName maps known names to their number; anything else is a typo
+    level = logging.getLevelName(LOG_LEVEL)
+    if isinstance(level, int):
+        logger.setLevel(level)
+    else:
+        logger.setLevel(logging.INFO)
+        logger.warning("⚠️ Unknown LOGISTICS_LOG_LEVEL %r, using INFO", LOG_LEVEL)
+
+
 def haversine(lat1, lon1, lat2, lon2):
     """
     Calculate the great-circle distance between two points on Earth using the Haversine formula.
@@ -148,6 +310,98 @@ def haversine(lat1, lon1, lat2, lon2):
     return R * c
 
 
+def haversine_term(phi1, lam1, phi2, lam2, cos_phi2):
+    """
+    The Haversine term a = hav(central angle), on coordinates in radians.
+    
+    a grows monotonically with distance, so nearest-neighbour ranking can
+    argmin over it directly and skip the sqrt/arcsin for every candidate;
+    use haversine_term_to_meters for the few entries that are kept.
+    
+    Args:
+        phi1, lam1: Latitude and longitude of the origin point(s) (in radians)
+        phi2, lam2: Latitudes and longitudes of the destinations (in radians)
+        cos_phi2: Precomputed np.cos(phi2)
+    
+    Returns:
+        NumPy array of Haversine terms in [0, 1], broadcast like the inputs
+    """
+    return np.sin((phi2 - phi1) / 2) ** 2 + \
+        np.cos(phi1) * cos_phi2 * np.sin((lam2 - lam1) / 2) ** 2
+
+
+def haversine_term_to_meters(a):
+    """
+    Convert Haversine terms from haversine_term to distances in meters.
+    
+    Args:
+        a: Haversine term(s)
+    
+    Returns:
+        Distance(s) in meters
+    """
+    R = 6371000
+    
+    # Clip guards against a rounding a slightly above 1 for antipodal points
+    return 2 * R * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def build_keyword_automaton(keyword_map):
+    """
+    Build an Aho-Corasick automaton over the station keywords.
+    
+    Each keyword stores its position in keyword_map so the highest-priority
+    match can be picked after a single scan of the text.
+    
+    Args:
+        keyword_map: Ordered list of (keyword, station_type) tuples
+    
+    Returns:
+        ahocorasick.Automaton, or None if pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for priority, (keyword, station_type) in enumerate(keyword_map):
+        automaton.add_word(keyword, (priority, keyword, station_type))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = build_keyword_automaton(NEED_TO_STATION_MAP)
+
+# Regex fallback when pyahocorasick is unavailable. The zero-width lookahead
+# reports a match at every position, so overlapping keywords are all seen.
+_KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword, _ in NEED_TO_STATION_MAP) + "))"
+)
+_KEYWORD_PRIORITY = {keyword: i for i, (keyword, _) in enumerate(NEED_TO_STATION_MAP)}
+
+
+def match_station_keyword(text):
+    """
+    Find the highest-priority NEED_TO_STATION_MAP keyword contained in text.
+    
+    Args:
+        text: Lowercased text to scan
+    
+    Returns:
+        (keyword, station_type) tuple, or None if no keyword matches
+    """
+    if _KEYWORD_AUTOMATON is not None:
+        hits = [value for _, value in _KEYWORD_AUTOMATON.iter(text)]
+        if not hits:
+            return None
+        _, keyword, station_type = min(hits)
+        return keyword, station_type
+    
+    priorities = [_KEYWORD_PRIORITY[m.group(1)] for m in _KEYWORD_PATTERN.finditer(text)]
+    if not priorities:
+        return None
+    return NEED_TO_STATION_MAP[min(priorities)]
+
+
 def get_registered_stations(db):
     """
     Fetch all active registered emergency stations from the database.
@@ -160,7 +414,7 @@ def get_registered_stations(db):
         Dictionary mapping station types to list of station dicts
         e.g., {'fire': [{'name': '...', 'lat': ..., 'lon': ...}], ...}
     """
-    global _stations_cache, _stations_cache_time
+    global _stations_cache, _stations_cache_time, _stations_arrays
     
     current_time = time.time()
     
@@ -172,7 +426,7 @@ def get_registered_stations(db):
     
     # Fetch active and offline stations (offline may just be temporarily unreachable)
     query = {'status': {'$in': ['active', 'offline']}}
-    cursor = stations_collection.find(query)
+    cursor = stations_collection.find(query, STATION_PROJECTION).batch_size(500)
     
     # Group stations by type
     stations_by_type = {}
@@ -195,21 +449,193 @@ def get_registered_stations(db):
     # Update cache
     _stations_cache = stations_by_type
     _stations_cache_time = current_time
+    _stations_arrays = build_station_arrays(stations_by_type)
     
     return stations_by_type
 
 
-def get_osrm_route(waypoints, profile="driving"):
+def build_station_arrays(stations_by_type):
+    """
+    Precompute coordinate arrays for each station type so nearest-station
+    ranking does not rebuild them on every lookup.
+    
+    Args:
+        stations_by_type: Dictionary mapping station types to list of station dicts
+    
+    Returns:
+        Dictionary mapping station types to
+        (stations, lats, lons, phis, lams, cos_phis), where only stations with
+        valid coordinates are kept, lats/lons are in degrees, phis/lams are the
+        same coordinates in radians with cos_phis = cos(phis), and every array
+        is aligned with the stations list
+    """
+    arrays = {}
+    for station_type, stations in stations_by_type.items():
+        # Skip stations without valid coordinates
+        valid = [s for s in stations if s.get('lat') is not None and s.get('lon') is not None]
+        if not valid:
+            continue
+        lats = np.array([s['lat'] for s in valid], dtype=np.float64)
+        lons = np.array([s['lon'] for s in valid], dtype=np.float64)
+        phis = np.radians(lats)
+        arrays[station_type] = (valid, lats, lons, phis, np.radians(lons), np.cos(phis))
+    return arrays
+
+
+def parse_osrm_response(response):
+    """
+    Decode an OSRM JSON response, with orjson when it is installed.
+    
+    orjson parses the raw bytes directly, skipping the text decode that
+    response.json() does first; full-overview routes can be >100 KB.
+    
+    Args:
+        response: requests.Response from OSRM
+    
+    Returns:
+        Decoded JSON object
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def get_osrm_route(waypoints, profile="driving", geometry=True):
+    """
+    Get a road-snapped route from OSRM between waypoints, served from the
+    route cache when the same rounded endpoints were routed recently.
+    
+    Failed lookups are not cached, so they are retried on the next dispatch.
+    
+    Args:
+        waypoints: List of (lat, lon) tuples
+        profile: OSRM profile - 'driving', 'walking', 'cycling'
+        geometry: Whether the route geometry is needed (see fetch_osrm_route)
+    
+    Returns:
+        Route dict as from fetch_osrm_route, or None if OSRM fails
+    """
+    # Keyed on the server too, so the persisted cache never serves routes
+    # from a previously configured OSRM_BASE_URL
+    key = (OSRM_BASE_URL, profile, geometry) + tuple((round(lat, 4), round(lon, 4)) for lat, lon in waypoints)
+    now = time.monotonic()
+    
+    with _route_cache_lock:
+        entry = _route_cache.get(key)
+        if entry and entry[0] > now:
+            _route_cache.move_to_end(key)
+            return entry[1]
+    
+    route, age = load_stored_route(key)
+    if route is None:
+        route = fetch_osrm_route(waypoints, profile, geometry)
+        if route is None:
+            return None
+        store_route(key, route)
+    
+    with _route_cache_lock:
+        _route_cache[key] = (now + OSRM_ROUTE_CACHE_TTL - age, route)
+        _route_cache.move_to_end(key)
+        while len(_route_cache) > OSRM_ROUTE_CACHE_SIZE:
+            _route_cache.popitem(last=False)
+    
+    return route
+
+
+def enable_route_cache_store(db):
+    """
+    Persist the OSRM route cache in MongoDB so it survives agent restarts.
+    
+    Entries expire through a TTL index on 'created_at'. If the index cannot
+    be created (e.g. OSRM_ROUTE_CACHE_TTL changed since it was built), the
+    cache stays in memory only.
+    
+    Args:
+        db: MongoDB database instance
+    """
+    global _route_cache_store
+    
+    collection = db[ROUTE_CACHE_COLLECTION]
+    try:
+        collection.create_index('created_at', expireAfterSeconds=int(OSRM_ROUTE_CACHE_TTL))
+    except PyMongoError as e:
+        logger.warning("⚠️ Route cache store disabled: %s", e)
+        return
+    
+    _route_cache_store = collection
+
+
+def route_cache_store_key(key):
+    """Document _id for a route cache key tuple."""
+    return "|".join(str(part) for part in key)
+
+
+def load_stored_route(key):
+    """
+    Look up a route in the persistent route cache.
+    
+    Args:
+        key: Route cache key tuple from get_osrm_route
+    
+    Returns:
+        (route, age_seconds), or (None, 0) on a miss or when the store is off
+    """
+    if _route_cache_store is None:
+        return None, 0
+    
+    now = datetime.now(timezone.utc)
+    try:
+        # The TTL monitor runs about once a minute, so also filter on age
+        doc = _route_cache_store.find_one({
+            '_id': route_cache_store_key(key),
+            'created_at': {'$gt': now - timedelta(seconds=OSRM_ROUTE_CACHE_TTL)},
+        })
+    except PyMongoError as e:
+        logger.debug("Route cache lookup failed: %s", e)
+        return None, 0
+    
+    if not doc:
+        return None, 0
+    
+    created_at = doc['created_at'].replace(tzinfo=timezone.utc)
+    return doc['route'], (now - created_at).total_seconds()
+
+
+def store_route(key, route):
+    """
+    Save a freshly fetched route to the persistent route cache.
+    
+    Args:
+        key: Route cache key tuple from get_osrm_route
+        route: Route dict from fetch_osrm_route
+    """
+    if _route_cache_store is None:
+        return
+    
+    try:
+        _route_cache_store.replace_one(
+            {'_id': route_cache_store_key(key)},
+            {'route': route, 'created_at': datetime.now(timezone.utc)},
+            upsert=True,
+        )
+    except PyMongoError as e:
+        logger.debug("Route cache write failed: %s", e)
+
+
+def fetch_osrm_route(waypoints, profile="driving", geometry=True):
     """
     Get a road-snapped route from OSRM between waypoints.
     
     Args:
         waypoints: List of (lat, lon) tuples
         profile: OSRM profile - 'driving', 'walking', 'cycling'
+        geometry: Request the full route geometry. Pass False when only
+            distance/duration are needed; OSRM then skips the overview,
+            which roughly halves response time and size.
     
     Returns:
-        dict with 'geometry' (list of [lat, lon]), 'distance' (meters), 'duration' (seconds)
-        or None if OSRM fails
+        dict with 'geometry' (list of [lat, lon], or None when geometry=False),
+        'distance' (meters), 'duration' (seconds), or None if OSRM fails
     """
     if len(waypoints) < 2:
         return None
@@ -218,43 +644,151 @@ def get_osrm_route(waypoints, profile="driving"):
     coords_str = ";".join([f"{lon},{lat}" for lat, lon in waypoints])
     url = f"{OSRM_BASE_URL}/route/v1/{profile}/{coords_str}"
     
-    params = {
-        "overview": "full",
-        "geometries": "geojson",
-        "steps": "false"
-    }
+    if geometry:
+        params = {
+            "overview": "full",
+            "geometries": "geojson" if OSRM_GEOMETRY_FORMAT == "geojson" else "polyline6",
+            "steps": "false"
+        }
+    else:
+        params = {
+            "overview": "false",
+            "alternatives": "false",
+            "steps": "false",
+            "annotations": "false",
+        }
     
     try:
-        response = requests.get(url, params=params, timeout=OSRM_TIMEOUT)
-        data = response.json()
+        response = _osrm_session.get(
+            url,
+            params=params,
+            timeout=(OSRM_CONNECT_TIMEOUT, OSRM_TIMEOUT),
+        )
+        data = parse_osrm_response(response)
         
         if data.get("code") != "Ok" or not data.get("routes"):
-            print(f"[Logistics] ⚠️ OSRM returned no routes: {data.get('code')}")
+            logger.warning("⚠️ OSRM returned no routes: %s", data.get('code'))
             return None
         
         osrm_route = data["routes"][0]
         
-        # Convert GeoJSON coordinates (lon, lat) to our format (lat, lon)
-        geometry = [[coord[1], coord[0]] for coord in osrm_route["geometry"]["coordinates"]]
+        route_geometry = None
+        if geometry and isinstance(osrm_route["geometry"], str):
+            # Encoded polyline6 is already in (lat, lon) order
+            route_geometry = decode_polyline(osrm_route["geometry"], precision=6).tolist()
+        elif geometry:
+            # Convert GeoJSON coordinates (lon, lat) to our format (lat, lon),
+            # swapping the columns in one NumPy pass rather than per point
+            coords = np.asarray(osrm_route["geometry"]["coordinates"], dtype=np.float64)
+            route_geometry = coords.reshape(-1, 2)[:, ::-1].tolist()
         
         return {
-            "geometry": geometry,
+            "geometry": route_geometry,
             "distance": osrm_route["distance"],  # meters
             "duration": osrm_route["duration"],  # seconds
         }
         
     except requests.exceptions.Timeout:
-        print("[Logistics] ⚠️ OSRM request timed out")
+        logger.warning("⚠️ OSRM request timed out")
+        return None
+    except requests.exceptions.RequestException as e:
+        logger.warning("⚠️ OSRM request failed: %s", e)
+        return None
+    except Exception as e:
+        logger.warning("⚠️ Error parsing OSRM response: %s", e)
+        return None
+
+
+def decode_polyline(encoded, precision=6):
+    """
+    Decode an encoded polyline (Google algorithm, as returned by OSRM).
+    
+    The string is a sequence of zigzag-encoded varints in 5-bit chunks,
+    holding alternating lat/lon deltas. All of it is decoded with NumPy
+    array operations instead of a per-character Python loop.
+    
+    Args:
+        encoded: Encoded polyline string
+        precision: Decimal places of the encoding (6 for polyline6, 5 for polyline)
+    
+    Returns:
+        NumPy array of shape (N, 2) with [lat, lon] rows in degrees
+    """
+    chunks = np.frombuffer(encoded.encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+    if chunks.size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    
+    # A chunk below 0x20 is the last one of its value
+    is_last = chunks < 0x20
+    starts = np.flatnonzero(np.concatenate(([True], is_last[:-1])))
+    value_index = np.cumsum(np.concatenate(([0], is_last[:-1])))
+    shift = 5 * (np.arange(chunks.size) - starts[value_index])
+    values = np.add.reduceat((chunks & 0x1f) << shift, starts)
+    
+    # Undo zigzag encoding, then accumulate the deltas
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+    coords = np.cumsum(deltas.reshape(-1, 2), axis=0)
+    return coords / float(10 ** precision)
+
+
+def get_osrm_table(sources, destinations, profile="driving"):
+    """
+    Get road durations/distances between every source and destination from
+    OSRM in a single /table request.
+    
+    Args:
+        sources: List of (lat, lon) tuples
+        destinations: List of (lat, lon) tuples
+        profile: OSRM profile - 'driving', 'walking', 'cycling'
+    
+    Returns:
+        (durations, distances) float arrays of shape (sources, destinations),
+        in seconds and meters with NaN for unreachable pairs, or None if OSRM fails
+    """
+    if not sources or not destinations:
+        return None
+    
+    # OSRM expects coordinates as lon,lat (reversed from our lat,lon format)
+    coords_str = ";".join(f"{lon},{lat}" for lat, lon in list(sources) + list(destinations))
+    url = f"{OSRM_BASE_URL}/table/v1/{profile}/{coords_str}"
+    
+    params = {
+        "sources": ";".join(str(i) for i in range(len(sources))),
+        "destinations": ";".join(str(len(sources) + i) for i in range(len(destinations))),
+        "annotations": "duration,distance",
+    }
+    
+    try:
+        response = _osrm_session.get(
+            url,
+            params=params,
+            timeout=(OSRM_CONNECT_TIMEOUT, OSRM_TIMEOUT),
+        )
+        data = parse_osrm_response(response)
+        
+        if data.get("code") != "Ok" or "durations" not in data:
+            logger.warning("⚠️ OSRM table returned: %s", data.get('code'))
+            return None
+        
+        # Unreachable pairs come back as null, which becomes NaN
+        durations = np.array(data["durations"], dtype=np.float64)
+        distances = np.array(data.get("distances", durations), dtype=np.float64)
+        
+        return durations, distances
+        
+    except requests.exceptions.Timeout:
+        logger.warning("⚠️ OSRM table request timed out")
         return None
     except requests.exceptions.RequestException as e:
-        print(f"[Logistics] ⚠️ OSRM request failed: {e}")
+        logger.warning("⚠️ OSRM table request failed: %s", e)
         return None
     except Exception as e:
-        print(f"[Logistics] ⚠️ Error parsing OSRM response: {e}")
+        logger.warning("⚠️ Error parsing OSRM table response: %s", e)
         return None
 
 
-def get_route_with_fallback(origin, destination, station_type, station_name):
+def get_route_with_fallback(origin, destination, station_type, station_name,
+                            straight_line_distance=None, road=None, geometry=True):
     """
     Get route from OSRM with fallback to straight-line if OSRM fails.
     
@@ -263,6 +797,12 @@ def get_route_with_fallback(origin, destination, station_type, station_name):
         destination: (lat, lon) tuple for end point
         station_type: Type of station (for metadata)
         station_name: Name of station (for metadata)
+        straight_line_distance: Haversine distance in meters, if already known
+            from nearest-station ranking (skips recomputing it on fallback)
+        road: (distance_m, duration_s) from OSRM /table, if known; preferred
+            over the Haversine estimate on fallback
+        geometry: Fetch the road geometry; when False only the road distance
+            and duration come from OSRM and the route is a straight line
     
     Returns:
         Route dictionary with geometry and metadata
@@ -270,43 +810,307 @@ def get_route_with_fallback(origin, destination, station_type, station_name):
     waypoints = [origin, destination]
     
     # Try OSRM first
-    osrm_result = get_osrm_route(waypoints)
+    osrm_result = get_osrm_route(waypoints, geometry=geometry)
     
     if osrm_result:
-        # OSRM success - use road-snapped route
+        # OSRM success - road metrics, with the road-snapped path if requested
+        route_geometry = osrm_result['geometry']
         return {
             'vehicle_id': 0,
-            'route': osrm_result['geometry'],
+            'route': route_geometry or [list(origin), list(destination)],
             'total_distance': osrm_result['distance'],
             'duration': osrm_result['duration'],
             'station_type': station_type,
             'station_name': station_name,
-            'is_road_snapped': True,
+            'is_road_snapped': route_geometry is not None,
         }
     else:
         # Fallback to straight-line route
-        print(f"[Logistics] ⚠️ Using fallback straight-line route")
-        distance = haversine(origin[0], origin[1], destination[0], destination[1])
-        return {
-            'vehicle_id': 0,
-            'route': [list(origin), list(destination)],
-            'total_distance': distance,
-            'duration': distance / 13.89,  # Assume ~50 km/h average
-            'station_type': station_type,
-            'station_name': station_name,
-            'is_road_snapped': False,
-        }
+        logger.warning("⚠️ Using fallback straight-line route")
+        return straight_line_route(
+            origin, destination, station_type, station_name,
+            straight_line_distance=straight_line_distance,
+            road=road,
+        )
+
+
+def straight_line_route(origin, destination, station_type, station_name,
+                        straight_line_distance=None, road=None):
+    """
+    Build a straight station -> incident route (no road geometry).
+    
+    Distance and duration come from the OSRM /table road metrics when
+    known, otherwise from the Haversine distance at ~50 km/h.
+    
+    Args:
+        origin: (lat, lon) tuple for start point
+        destination: (lat, lon) tuple for end point
+        station_type: Type of station (for metadata)
+        station_name: Name of station (for metadata)
+        straight_line_distance: Haversine distance in meters, if already known
+        road: (distance_m, duration_s) from OSRM /table, if known
+    
+    Returns:
+        Route dictionary with a two-point geometry
+    """
+    if road:
+        distance, duration = road
+    else:
+        distance = straight_line_distance
+        if distance is None:
+            distance = haversine(origin[0], origin[1], destination[0], destination[1])
+        duration = distance / 13.89  # Assume ~50 km/h average
+    
+    return {
+        'vehicle_id': 0,
+        'route': [list(origin), list(destination)],
+        'total_distance': distance,
+        'duration': duration,
+        'station_type': station_type,
+        'station_name': station_name,
+        'is_road_snapped': False,
+    }
+
+
+def is_valid_coordinate(value):
+    """
+    Check that a stored coordinate is a finite real number.
+    
+    None, NaN, strings and booleans would otherwise reach the vectorised
+    station lookup and either pick a bogus station or abort the cycle.
+    
+    Args:
+        value: Latitude or longitude read from MongoDB
+    
+    Returns:
+        True if the value can be used for distance calculations
+    """
+    return (
+        isinstance(value, numbers.Real)
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    )
+
+
+def build_report_plan(db, report):
+    """
+    Build the dispatch plan for an analyzed report.
+    
+    Only resolves what is cheap and local (location, station type and any
+    preassigned station); the nearest station and the route are filled in
+    later for the whole cycle at once.
+    
+    Args:
+        db: MongoDB database instance
+        report: Report document from MongoDB
+    
+    Returns:
+        Plan dict with 'item', 'lat', 'lng', 'station_type' and 'station'
+        (None unless preassigned), or None if the report has no usable location
+    """
+    location = report.get('location') or {}
+    if not is_valid_coordinate(location.get('lat')) or not is_valid_coordinate(location.get('lng')):
+        logger.warning("⚠️ Report %s has no valid location. Skipping...", report.get('reportId', report['_id']))
+        return None
+    
+    return {
+        'item': report,
+        'lat': location['lat'],
+        'lng': location['lng'],
+        # Determine which type of station should respond
+        'station_type': determine_station_type(report),
+        'station': find_registered_station(db, get_preassigned_station(report)),
+    }
+
+
+def build_need_plan(db, need):
+    """
+    Build the dispatch plan for a verified need.
+    
+    Args:
+        db: MongoDB database instance
+        need: Need document from MongoDB
+    
+    Returns:
+        Plan dict as from build_report_plan, or None if the need has no usable coordinates
+    """
+    coords = need.get('coordinates') or {}
+    if not is_valid_coordinate(coords.get('lat')) or not is_valid_coordinate(coords.get('lng')):
+        logger.warning("⚠️ Need %s has no valid coordinates. Skipping...", need['_id'])
+        return None
+    
+    return {
+        'item': need,
+        'lat': coords['lat'],
+        'lng': coords['lng'],
+        # Determine which type of station should respond
+        'station_type': determine_station_type_for_need(need),
+        'station': find_registered_station(db, get_preassigned_station(need)),
+    }
+
 
+def plan_station_info(plan):
+    """
+    Station summary stored on the mission document for a dispatch plan.
+    
+    Args:
+        plan: Plan dict with a resolved 'station'
+    
+    Returns:
+        Dict with the station's type, name, lat and lon
+    """
+    station = plan['station']
+    return {
+        'type': plan['station_type'],
+        'name': station['name'],
+        'lat': station['lat'],
+        'lon': station['lon'],
+    }
+
+
+def route_plan(plan):
+    """
+    Fetch the station -> incident route for a dispatch plan.
+    
+    Args:
+        plan: Plan dict with 'lat', 'lng', 'station_type', 'station' and
+            optionally 'distance' and 'road' (see assign_nearest_stations)
+    
+    Returns:
+        Route dictionary from get_route_with_fallback, or from
+        straight_line_route when geometry is disabled and /table already
+        measured the road. With geometry disabled and no /table metrics,
+        OSRM is still asked for the road distance/duration, without geometry.
+    """
+    station = plan['station']
+    origin = (station['lat'], station['lon'])
+    destination = (plan['lat'], plan['lng'])
+    
+    if plan.get('road') and not NEED_ROUTE_GEOMETRY:
+        return straight_line_route(
+            origin, destination, plan['station_type'], station['name'],
+            road=plan['road'],
+        )
+    
+    return get_route_with_fallback(
+        origin,
+        destination,
+        plan['station_type'],
+        station['name'],
+        straight_line_distance=plan.get('distance'),
+        road=plan.get('road'),
+        geometry=NEED_ROUTE_GEOMETRY,
+    )
+
+
+def claimable_dispatch_states(now):
+    """
+    dispatch_status conditions for items that may be claimed this cycle.
+    
+    Args:
+        now: Current poll cycle time
+    
+    Returns:
+        List of conditions for a $or clause
+    """
+    return [
+        {'dispatch_status': {'$exists': False}},
+        {'dispatch_status': 'Unassigned'},
+        {'dispatch_status': 'Pending'},  # Include rerouted items
+        # Claimed by a cycle that never finished
+        {
+            'dispatch_status': 'Processing',
+            'claimed_at': {'$lt': now - timedelta(seconds=CLAIM_TIMEOUT_SECONDS)},
+        },
+    ]
+
+
+def claim_items(collection, query, projection, claim_token, now):
+    """
+    Atomically claim dispatchable documents and return the claimed ones.
+    
+    One update_many flips every match to 'Processing' under this cycle's
+    claim token, and a find reads back exactly the documents this cycle
+    won. Each document update is atomic, so concurrent agents never claim
+    the same item.
+    
+    Args:
+        collection: Reports or needs collection
+        query: Dispatch query (without dispatch_status conditions); must
+            include 'status' so both steps can use the status index
+        projection: Fields to return
+        claim_token: ObjectId identifying this poll cycle
+        now: Current poll cycle time
+    
+    Returns:
+        List of claimed documents
+    """
+    collection.update_many(
+        {**query, '$or': claimable_dispatch_states(now)},
+        [{
+            '$set': {
+                # Remember the state to restore on release; a stale claim
+                # keeps the state recorded by the cycle that abandoned it
+                'claimed_from': {
+                    '$cond': [
+                        {'$eq': ['$dispatch_status', 'Processing']},
+                        '$claimed_from',
+                        {'$ifNull': ['$dispatch_status', 'Unassigned']},
+                    ]
+                },
+                'dispatch_status': 'Processing',
+                'claim_token': claim_token,
+                'claimed_at': now,
+            }
+        }],
+    )
+    return list(collection.find(
+        {'status': query['status'], 'dispatch_status': 'Processing', 'claim_token': claim_token},
+        projection,
+    ))
 
-def get_critical_reports(db):
+
+def release_claims(db, claim_token):
     """
-    Query MongoDB for critical unassigned reports.
+    Return items claimed this cycle but not dispatched to the queue.
+    
+    Dispatched items were already set to 'Assigned' by save_missions, so
+    only skipped or failed items are still 'Processing' under the token.
+    Each goes back to the state it was claimed from, so rerouted items
+    stay 'Pending'.
     
     Args:
         db: MongoDB database instance
+        claim_token: ObjectId identifying this poll cycle
+    """
+    claim_fields = {'claim_token': '', 'claimed_at': '', 'claimed_from': ''}
+    owned_reports = {'status': {'$in': ['Analyzed_Full', 'Analyzed']}, 'dispatch_status': 'Processing', 'claim_token': claim_token}
+    owned_needs = {'status': 'Verified', 'dispatch_status': 'Processing', 'claim_token': claim_token}
+    try:
+        for collection, owned in ((db[REPORTS_COLLECTION], owned_reports), (db[NEEDS_COLLECTION], owned_needs)):
+            collection.update_many(
+                {**owned, 'claimed_from': 'Pending'},
+                {'$set': {'dispatch_status': 'Pending'}, '$unset': claim_fields},
+            )
+            collection.update_many(
+                owned,
+                {'$set': {'dispatch_status': 'Unassigned'}, '$unset': claim_fields},
+            )
+    except PyMongoError as e:
+        logger.warning("⚠️ Failed to release claimed items (retried after %ss): %s", CLAIM_TIMEOUT_SECONDS, e)
+
+
+def get_critical_reports(db, claim_token, now):
+    """
+    Claim critical unassigned reports for this poll cycle.
+    
+    Args:
+        db: MongoDB database instance
+        claim_token: ObjectId identifying this poll cycle
+        now: Current poll cycle time
     
     Returns:
-        List of report documents
+        List of claimed report documents
     """
     reports_collection = db[REPORTS_COLLECTION]
     
@@ -315,26 +1119,24 @@ def get_critical_reports(db):
         'oracleData.severity': {'$gt': SEVERITY_THRESHOLD},
         'status': {'$in': ['Analyzed_Full', 'Analyzed']},
         'emergencyStatus': {'$nin': ['rejected']},
-        '$or': [
-            {'dispatch_status': {'$exists': False}},
-            {'dispatch_status': 'Unassigned'},
-            {'dispatch_status': 'Pending'}  # Include rerouted reports
-        ]
+        'location.lat': {'$exists': True},
+        'location.lng': {'$exists': True}
     }
     
-    reports = list(reports_collection.find(query))
-    return reports
+    return claim_items(reports_collection, query, REPORT_PROJECTION, claim_token, now)
 
 
-def get_verified_needs(db):
+def get_verified_needs(db, claim_token, now):
     """
-    Query MongoDB for verified needs that haven't been dispatched yet.
+    Claim verified needs that haven't been dispatched yet for this poll cycle.
     
     Args:
         db: MongoDB database instance
+        claim_token: ObjectId identifying this poll cycle
+        now: Current poll cycle time
     
     Returns:
-        List of verified need documents
+        List of claimed need documents
     """
     needs_collection = db[NEEDS_COLLECTION]
     
@@ -342,17 +1144,11 @@ def get_verified_needs(db):
     query = {
         'status': 'Verified',
         'emergencyStatus': {'$nin': ['rejected']},
-        '$or': [
-            {'dispatch_status': {'$exists': False}},
-            {'dispatch_status': 'Unassigned'},
-            {'dispatch_status': 'Pending'}  # Include rerouted needs
-        ],
         'coordinates.lat': {'$exists': True},
         'coordinates.lng': {'$exists': True}
     }
     
-    needs = list(needs_collection.find(query))
-    return needs
+    return claim_items(needs_collection, query, NEED_PROJECTION, claim_token, now)
 
 
 def find_registered_station(db, station_reference):
@@ -457,21 +1253,40 @@ def determine_station_type_for_need(need):
     preassigned_station = get_preassigned_station(need)
     if preassigned_station and preassigned_station.get('type'):
         station_type = preassigned_station.get('type')
-        print(f"[Logistics]    Using preassigned {station_type.upper()} station ({preassigned_station.get('name', 'Unknown')})")
+        logger.debug("   Using preassigned %s station (%s)", station_type.upper(), preassigned_station.get('name', 'Unknown'))
         return station_type
     
-    need_type = need.get('triageData', {}).get('needType', '').lower()
-    raw_message = need.get('rawMessage', '').lower()
-    details = need.get('triageData', {}).get('details', '').lower()
+    return classify_need_text(
+        need.get('triageData', {}).get('needType', ''),
+        need.get('rawMessage', ''),
+        need.get('triageData', {}).get('details', ''),
+    )
+
+
+@lru_cache(maxsize=2048)
+def classify_need_text(need_type, raw_message, details):
+    """
+    Keyword classification behind determine_station_type_for_need, cached
+    on the need's text signature.
+    
+    Args:
+        need_type: Triage need type
+        raw_message: Original SMS text
+        details: Triage details
     
-    # Combine all text for keyword matching
-    combined_text = f"{need_type} {raw_message} {details}"
+    Returns:
+        Station type string (police, hospital, fire, rescue)
+    """
+    # Combine all text for keyword matching (lowercased in one pass)
+    combined_text = f"{need_type} {raw_message} {details}".lower()
+    need_type = need_type.lower()
     
     # Check keywords
-    for keyword, station_type in NEED_TO_STATION_MAP:
-        if keyword in combined_text:
-            print(f"[Logistics]    Matched keyword '{keyword}' -> {station_type.upper()}")
-            return station_type
+    match = match_station_keyword(combined_text)
+    if match:
+        keyword, station_type = match
+        logger.debug("   Matched keyword '%s' -> %s", keyword, station_type.upper())
+        return station_type
     
     # Map need types directly
     need_type_map = {
@@ -483,77 +1298,55 @@ def determine_station_type_for_need(need):
     }
     
     if need_type in need_type_map:
-        print(f"[Logistics]    Matched needType '{need_type}' -> {need_type_map[need_type].upper()}")
+        logger.debug("   Matched needType '%s' -> %s", need_type, need_type_map[need_type].upper())
         return need_type_map[need_type]
     
-    print(f"[Logistics]    No match found, defaulting to RESCUE")
+    logger.debug("   No match found, defaulting to RESCUE")
     return "rescue"
 
 
-def save_need_mission(db, routes, need_ids, station_info=None):
+def build_need_mission(routes, need_ids, station_info=None, timestamp=None):
     """
-    Save the generated mission for verified needs to MongoDB and update processed needs.
+    Build the mission document for verified needs (persisted by save_missions).
     
     Args:
-        db: MongoDB database instance
         routes: List of route dictionaries
         need_ids: List of ObjectIds of processed needs
         station_info: Information about the dispatching station
-    """
-    missions_collection = db[MISSIONS_COLLECTION]
-    needs_collection = db[NEEDS_COLLECTION]
+        timestamp: Poll cycle time shared by the batch (defaults to now)
     
-    # Create mission document
-    mission = {
+    Returns:
+        Mission document
+    """
+    return {
+        # Assigned client-side so need updates can reference it up front
+        '_id': ObjectId(),
         'routes': routes,
-        'timestamp': datetime.now(timezone.utc),
+        'timestamp': timestamp or datetime.now(timezone.utc),
         'need_ids': need_ids,
         'source': 'verified_need',
         'status': 'Active',
         'num_vehicles': NUM_VEHICLES,
         'station': station_info,
     }
-    
-    # Insert mission
-    result = missions_collection.insert_one(mission)
-    mission_id = result.inserted_id
-    
-    # Update all processed needs to 'InProgress' and mark as dispatched
-    needs_collection.update_many(
-        {'_id': {'$in': need_ids}},
-        {
-            '$set': {
-                'dispatch_status': 'Assigned',
-                'status': 'InProgress',
-                'mission_id': mission_id,
-                'assigned_at': datetime.now(timezone.utc),
-                'assigned_station': station_info,
-            }
-        }
-    )
-    
-    return mission_id
 
 
-def get_nearest_station(db, report_lat, report_lng, station_type):
+def get_station_arrays(station_type):
     """
-    Find the nearest registered station of a given type to the report location.
+    Return the cached coordinate arrays for a station type, falling back to
+    related types when no station of the exact type is registered.
     
     Args:
-        db: MongoDB database instance
-        report_lat: Report latitude
-        report_lng: Report longitude
         station_type: Type of station (police, hospital, fire, rescue)
     
     Returns:
-        Nearest station dict with name, lat, lon
+        (stations, lats, lons, phis, lams, cos_phis) tuple from
+        build_station_arrays, or None
     """
-    # Get registered stations from database
-    registered_stations = get_registered_stations(db)
-    stations = registered_stations.get(station_type, [])
+    station_arrays = _stations_arrays.get(station_type)
     
     # If no stations of the exact type, try related types
-    if not stations:
+    if not station_arrays:
         # Fallback mapping: try related station types
         fallback_types = {
             'hospital': ['ambulance', 'rescue'],
@@ -563,28 +1356,204 @@ def get_nearest_station(db, report_lat, report_lng, station_type):
             'rescue': ['fire', 'hospital', 'police'],
         }
         for fallback_type in fallback_types.get(station_type, []):
-            stations = registered_stations.get(fallback_type, [])
-            if stations:
-                print(f"[Logistics]    No {station_type.upper()} stations, using {fallback_type.upper()} instead")
+            station_arrays = _stations_arrays.get(fallback_type)
+            if station_arrays:
+                logger.info("   No %s stations, using %s instead", station_type.upper(), fallback_type.upper())
                 break
     
-    if not stations:
-        print(f"[Logistics]    ⚠️ No registered stations available for {station_type.upper()}")
-        return DEFAULT_DEPOT
+    if not station_arrays:
+        logger.warning("   ⚠️ No registered stations available for %s", station_type.upper())
+        return None
     
-    nearest = None
-    min_distance = float('inf')
+    return station_arrays
+
+
+def get_nearest_stations_batch(db, points, station_types, executor=None):
+    """
+    Find the nearest registered station for many locations at once.
     
-    for station in stations:
-        # Skip stations without valid coordinates
-        if station.get('lat') is None or station.get('lon') is None:
+    Locations are grouped by station type and each group is ranked against
+    that type's stations with a single (locations x stations) Haversine
+    broadcast, then the closest candidates are re-ranked by road duration
+    with OSRM /table (see rank_by_road_duration). The /table requests of
+    every group are issued together before any result is awaited.
+    
+    Args:
+        db: MongoDB database instance
+        points: List of (lat, lng) tuples
+        station_types: List of station types, aligned with points
+        executor: Optional executor to run the /table requests on
+            concurrently (requests run inline when None)
+    
+    Returns:
+        List of (station, distance, road) tuples aligned with points, where
+        station is the nearest station dict (with name, lat, lon), distance
+        is its Haversine distance in meters (None when falling back to
+        DEFAULT_DEPOT) and road is (distance_m, duration_s) from OSRM /table,
+        or None when the station was not chosen by road
+    """
+    # Refresh the station cache (and its coordinate arrays) if stale
+    get_registered_stations(db)
+    
+    nearest = [(DEFAULT_DEPOT, None, None)] * len(points)
+    
+    indices_by_type = {}
+    for i, station_type in enumerate(station_types):
+        indices_by_type.setdefault(station_type, []).append(i)
+    
+    groups = []
+    for station_type, indices in indices_by_type.items():
+        station_arrays = get_station_arrays(station_type)
+        if not station_arrays:
             continue
-        dist = haversine(report_lat, report_lng, station['lat'], station['lon'])
-        if dist < min_distance:
-            min_distance = dist
-            nearest = station
+        
+        stations, lats, lons, phis, lams, cos_phis = station_arrays
+        point_lats = np.array([points[i][0] for i in indices], dtype=np.float64)
+        point_lngs = np.array([points[i][1] for i in indices], dtype=np.float64)
+        
+        # Rank every candidate for every location in one vectorized pass,
+        # on the Haversine term (monotonic in distance, no sqrt/arcsin)
+        hav = haversine_term(
+            np.radians(point_lats)[:, None],
+            np.radians(point_lngs)[:, None],
+            phis, lams, cos_phis,
+        )
+        
+        # Start re-ranking the closest candidates by road duration when
+        # there is a choice
+        road_tables = None
+        if len(stations) > 1:
+            road_tables = submit_road_tables(point_lats, point_lngs, lats, lons, hav, executor)
+        groups.append((indices, stations, hav, road_tables))
+    
+    for indices, stations, hav, road_tables in groups:
+        choices = hav.argmin(axis=1)
+        road = np.full((len(indices), 2), np.nan)
+        if road_tables:
+            rank_by_road_duration(road_tables, choices, road)
+        
+        # Only the chosen stations need a distance in meters
+        chosen_distances = haversine_term_to_meters(hav[np.arange(len(indices)), choices])
+        for row, (i, station_index) in enumerate(zip(indices, choices)):
+            road_metrics = None
+            if not np.isnan(road[row]).any():
+                road_metrics = (float(road[row, 0]), float(road[row, 1]))
+            nearest[i] = (stations[int(station_index)], float(chosen_distances[row]), road_metrics)
+    
+    return nearest
+
+
+def submit_road_tables(point_lats, point_lngs, lats, lons, ranking, executor=None):
+    """
+    Request OSRM /table durations from each incident's closest stations.
+    
+    For each incident only the OSRM_TABLE_CANDIDATES closest stations (by
+    Haversine) are considered, and incidents are sent to OSRM /table in
+    chunks that stay under OSRM_TABLE_MAX_COORDS.
+    
+    Args:
+        point_lats, point_lngs: Incident coordinate arrays, shape (P,)
+        lats, lons: Station coordinate arrays, shape (S,)
+        ranking: Haversine distance (or haversine_term) matrix, shape (P, S)
+        executor: Optional executor to submit the requests to
+    
+    Returns:
+        (candidates, chunks) for rank_by_road_duration, where chunks is a
+        list of (rows, chunk_stations, table_future), or None when fewer
+        than two candidates are available
+    """
+    num_candidates = min(OSRM_TABLE_CANDIDATES, len(lats))
+    if num_candidates < 2:
+        return None
     
-    return nearest if nearest else DEFAULT_DEPOT
+    # Closest candidates per incident (unordered), shape (P, k)
+    candidates = np.argpartition(ranking, num_candidates - 1, axis=1)[:, :num_candidates]
+    chunk_size = max(1, OSRM_TABLE_MAX_COORDS // (num_candidates + 1))
+    
+    chunks = []
+    for start in range(0, len(point_lats), chunk_size):
+        rows = slice(start, start + chunk_size)
+        chunk_stations = np.unique(candidates[rows])
+        args = (
+            list(zip(lats[chunk_stations], lons[chunk_stations])),
+            list(zip(point_lats[rows], point_lngs[rows])),
+        )
+        if executor is not None:
+            table_future = executor.submit(get_osrm_table, *args)
+        else:
+            table_future = Future()
+            table_future.set_result(get_osrm_table(*args))
+        chunks.append((rows, chunk_stations, table_future))
+    
+    return candidates, chunks
+
+
+def rank_by_road_duration(road_tables, choices, road):
+    """
+    Replace Haversine station choices with the fastest station by road.
+    
+    Chunks where the table call fails, and incidents no candidate can
+    reach, keep the Haversine choice.
+    
+    Args:
+        road_tables: (candidates, chunks) from submit_road_tables
+        choices: Station index per incident, shape (P,); updated in place
+        road: Road [distance_m, duration_s] per incident, shape (P, 2), NaN
+            where unknown; filled in place for re-ranked incidents
+    """
+    candidates, chunks = road_tables
+    
+    for rows, chunk_stations, table_future in chunks:
+        table = table_future.result()
+        if table is None:
+            continue
+        
+        # (incidents x stations) durations, limited to each incident's candidates
+        durations = table[0].T
+        allowed = (chunk_stations[None, :] == candidates[rows][:, :, None]).any(axis=1)
+        durations = np.where(allowed, durations, np.nan)
+        
+        reachable = ~np.isnan(durations).all(axis=1)
+        if not reachable.any():
+            continue
+        fastest = np.nanargmin(durations[reachable], axis=1)
+        chunk_choices = choices[rows]
+        chunk_choices[reachable] = chunk_stations[fastest]
+        
+        # Keep the winners' road metrics for the mission / fallback route
+        reachable_rows = np.flatnonzero(reachable)
+        chunk_road = road[rows]
+        chunk_road[reachable, 0] = table[1].T[reachable_rows, fastest]
+        chunk_road[reachable, 1] = durations[reachable_rows, fastest]
+
+
+def assign_nearest_stations(db, plans, executor=None):
+    """
+    Fill in the nearest station for dispatch plans without a preassigned one.
+    
+    Also records the ranking distance under 'distance' so the straight-line
+    fallback route does not recompute it, and the OSRM /table road metrics
+    under 'road' (None if the station was not chosen by road).
+    
+    Args:
+        db: MongoDB database instance
+        plans: List of plan dicts with 'lat', 'lng', 'station_type' and 'station'
+        executor: Optional executor for the OSRM /table requests
+    """
+    pending = [plan for plan in plans if plan['station'] is None]
+    if not pending:
+        return
+    
+    nearest = get_nearest_stations_batch(
+        db,
+        [(plan['lat'], plan['lng']) for plan in pending],
+        [plan['station_type'] for plan in pending],
+        executor,
+    )
+    for plan, (station, distance, road) in zip(pending, nearest):
+        plan['station'] = station
+        plan['distance'] = distance
+        plan['road'] = road
 
 
 def determine_station_type(report):
@@ -604,81 +1573,343 @@ def determine_station_type(report):
     """
     preassigned_station = get_preassigned_station(report)
     if preassigned_station and preassigned_station.get('type'):
-        print(f"[Logistics]    Using preassigned {preassigned_station.get('type').upper()} station - {preassigned_station.get('name', 'Unknown')}")
+        logger.debug("   Using preassigned %s station - %s", preassigned_station.get('type').upper(), preassigned_station.get('name', 'Unknown'))
         return preassigned_station.get('type')
     
     # Check oracle data needs
-    needs = report.get('oracleData', {}).get('needs', [])
+    needs = tuple(report.get('oracleData', {}).get('needs', []))
     tag = report.get('sentinelData', {}).get('tag', '').lower()
     text = report.get('text', '').lower()
     
+    return classify_report_text(text, tag, needs)
+
+
+@lru_cache(maxsize=2048)
+def classify_report_text(text, tag, needs):
+    """
+    Keyword classification behind determine_station_type.
+    
+    Cached on the report's text signature, so a report that is seen again
+    on a later poll (e.g. after a failed save) is not rescanned.
+    
+    Args:
+        text: Lowercased report text
+        tag: Lowercased image classification tag
+        needs: Tuple of oracle-inferred needs
+    
+    Returns:
+        Station type string (police, hospital, fire, rescue)
+    """
     # Priority 1: Check text content FIRST (user's explicit message takes priority)
     # This ensures stampede/crowd/riot mentions route to police before "Medical" needs
-    for keyword, station_type in NEED_TO_STATION_MAP:
-        if keyword in text:
-            print(f"[Logistics]    Matched text keyword '{keyword}' -> {station_type.upper()}")
-            return station_type
+    match = match_station_keyword(text)
+    if match:
+        keyword, station_type = match
+        logger.debug("   Matched text keyword '%s' -> %s", keyword, station_type.upper())
+        return station_type
     
     # Priority 2: Check tag (from image analysis)
-    for keyword, station_type in NEED_TO_STATION_MAP:
-        if keyword in tag:
-            print(f"[Logistics]    Matched tag '{tag}' with '{keyword}' -> {station_type.upper()}")
-            return station_type
+    match = match_station_keyword(tag)
+    if match:
+        keyword, station_type = match
+        logger.debug("   Matched tag '%s' with '%s' -> %s", tag, keyword, station_type.upper())
+        return station_type
     
     # Priority 3: Check needs array (secondary classification from AI)
     for need in needs:
-        need_lower = need.lower()
-        for keyword, station_type in NEED_TO_STATION_MAP:
-            if keyword in need_lower:
-                print(f"[Logistics]    Matched need '{need}' -> {station_type.upper()}")
-                return station_type
+        match = match_station_keyword(need.lower())
+        if match:
+            _, station_type = match
+            logger.debug("   Matched need '%s' -> %s", need, station_type.upper())
+            return station_type
     
     # Default to rescue
-    print(f"[Logistics]    No match found, defaulting to RESCUE")
+    logger.debug("   No match found, defaulting to RESCUE")
     return "rescue"
 
 
-def save_mission(db, routes, report_ids, station_info=None):
+def build_mission(routes, report_ids, station_info=None, timestamp=None):
     """
-    Save the generated mission to MongoDB and update processed reports.
+    Build the mission document for processed reports (persisted by save_missions).
     
     Args:
-        db: MongoDB database instance
         routes: List of route dictionaries
         report_ids: List of ObjectIds of processed reports
         station_info: Information about the dispatching station
-    """
-    missions_collection = db[MISSIONS_COLLECTION]
-    reports_collection = db[REPORTS_COLLECTION]
+        timestamp: Poll cycle time shared by the batch (defaults to now)
     
-    # Create mission document
-    mission = {
+    Returns:
+        Mission document
+    """
+    return {
+        # Assigned client-side so report updates can reference it up front
+        '_id': ObjectId(),
         'routes': routes,
-        'timestamp': datetime.now(timezone.utc),
+        'timestamp': timestamp or datetime.now(timezone.utc),
         'report_ids': report_ids,
         'status': 'Active',
         'num_vehicles': NUM_VEHICLES,
         'station': station_info,
     }
+
+
+def save_missions(db, report_missions, need_missions, claim_token, now=None):
+    """
+    Save all missions generated in a poll cycle and update the processed
+    reports and needs.
     
-    # Insert mission
-    result = missions_collection.insert_one(mission)
-    mission_id = result.inserted_id
+    Items are assigned before their missions are inserted, and only while
+    this cycle still owns the claim: an item rerouted from the dashboard
+    or re-claimed after CLAIM_TIMEOUT_SECONDS is left alone, and a mission
+    that lost all of its items is never written. Each step is one batched
+    write per collection, so a cycle costs a constant number of
+    round-trips instead of two per item.
+    
+    Args:
+        db: MongoDB database instance
+        report_missions: List of mission documents from build_mission
+        need_missions: List of mission documents from build_need_mission
+        claim_token: ObjectId identifying this poll cycle
+        now: Poll cycle time, stamped as 'assigned_at' on every processed
+            item (defaults to the current time)
+    
+    Returns:
+        (report_missions, need_missions) that were inserted
+    """
+    now = now or datetime.now(timezone.utc)
+    reports_collection = db[REPORTS_COLLECTION]
+    needs_collection = db[NEEDS_COLLECTION]
     
     # Update all processed reports to 'Assigned'
-    reports_collection.update_many(
-        {'_id': {'$in': report_ids}},
-        {
-            '$set': {
-                'dispatch_status': 'Assigned',
-                'mission_id': mission_id,
-                'assigned_at': datetime.now(timezone.utc),
-                'assigned_station': station_info,
+    report_missions = assign_claimed_items(
+        reports_collection, report_missions, 'report_ids', claim_token, now
+    )
+    # Update all processed needs to 'InProgress' and mark as dispatched
+    need_missions = assign_claimed_items(
+        needs_collection, need_missions, 'need_ids', claim_token, now,
+        {'status': 'InProgress'},
+    )
+    
+    inserted_ids = {
+        mission['_id']
+        for mission in insert_missions(db, report_missions + need_missions)
+    }
+    finish_assignment(reports_collection, report_missions, 'report_ids', claim_token, inserted_ids)
+    finish_assignment(needs_collection, need_missions, 'need_ids', claim_token, inserted_ids,
+                      {'status': 'Verified'})
+    
+    report_missions = [m for m in report_missions if m['_id'] in inserted_ids]
+    need_missions = [m for m in need_missions if m['_id'] in inserted_ids]
+    return report_missions, need_missions
+
+
+def assign_claimed_items(collection, missions, ids_field, claim_token, now, extra_fields=None):
+    """
+    Mark the items of each mission 'Assigned' if this cycle still owns them.
+    
+    The claim token stays on the items until finish_assignment, so a
+    mission whose insert fails can be handed back to release_claims.
+    
+    Args:
+        collection: Reports or needs collection
+        missions: Mission documents built this cycle
+        ids_field: 'report_ids' or 'need_ids'
+        claim_token: ObjectId identifying this poll cycle
+        now: Poll cycle time stamped as 'assigned_at'
+        extra_fields: Additional fields to set on assignment
+    
+    Returns:
+        Missions that still have items, trimmed to the items assigned
+    """
+    if not missions:
+        return []
+    
+    updates = [
+        UpdateMany(
+            {'_id': {'$in': mission[ids_field]}, 'dispatch_status': 'Processing', 'claim_token': claim_token},
+            {
+                '$set': {
+                    'dispatch_status': 'Assigned',
+                    'mission_id': mission['_id'],
+                    'assigned_at': now,
+                    'assigned_station': mission['station'],
+                    **(extra_fields or {}),
+                },
             }
+        )
+        for mission in missions
+    ]
+    expected = sum(len(mission[ids_field]) for mission in missions)
+    try:
+        matched = collection.bulk_write(updates, ordered=False).matched_count
+    except BulkWriteError as e:
+        logger.error("❌ Failed to assign some %s: %s", collection.name, e.details.get('writeErrors'))
+        matched = e.details.get('nMatched', 0)
+    if matched == expected:
+        return missions
+    
+    # Some items were rerouted or re-claimed since this cycle claimed them;
+    # read back which ones each mission actually got
+    assigned = {}
+    for doc in collection.find(
+        {
+            '_id': {'$in': [item_id for mission in missions for item_id in mission[ids_field]]},
+            'dispatch_status': 'Assigned',
+            'claim_token': claim_token,
+        },
+        {'mission_id': 1},
+    ):
+        assigned.setdefault(doc['mission_id'], []).append(doc['_id'])
+    
+    kept = []
+    for mission in missions:
+        item_ids = assigned.get(mission['_id'], [])
+        if len(item_ids) < len(mission[ids_field]):
+            logger.warning(
+                "⚠️ Mission %s lost %d of %d %s to a reroute or another agent",
+                mission['_id'], len(mission[ids_field]) - len(item_ids),
+                len(mission[ids_field]), collection.name,
+            )
+        if item_ids:
+            mission[ids_field] = item_ids
+            kept.append(mission)
+    return kept
+
+
+def finish_assignment(collection, missions, ids_field, claim_token, inserted_ids, revert_fields=None):
+    """
+    Drop the claim from items whose mission was saved, and put items whose
+    mission failed to insert back under the claim for release_claims.
+    
+    Args:
+        collection: Reports or needs collection
+        missions: Missions returned by assign_claimed_items
+        ids_field: 'report_ids' or 'need_ids'
+        claim_token: ObjectId identifying this poll cycle
+        inserted_ids: _ids of the missions that were inserted
+        revert_fields: Fields restored on items of failed missions
+    """
+    saved = [item_id for m in missions if m['_id'] in inserted_ids for item_id in m[ids_field]]
+    failed = [item_id for m in missions if m['_id'] not in inserted_ids for item_id in m[ids_field]]
+    owned = {'dispatch_status': 'Assigned', 'claim_token': claim_token}
+    
+    if saved:
+        collection.update_many(
+            {'_id': {'$in': saved}, **owned},
+            {'$unset': {'claim_token': '', 'claimed_at': '', 'claimed_from': ''}},
+        )
+    if failed:
+        collection.update_many(
+            {'_id': {'$in': failed}, **owned},
+            {
+                '$set': {'dispatch_status': 'Processing', **(revert_fields or {})},
+                '$unset': {'mission_id': '', 'assigned_at': '', 'assigned_station': ''},
+            },
+        )
+
+
+def insert_missions(db, missions):
+    """
+    Insert mission documents in a single unordered batch.
+    
+    Missions that fail to insert are dropped from the result so their
+    reports/needs are handed back by finish_assignment and retried on the next poll.
+    
+    Args:
+        db: MongoDB database instance
+        missions: List of mission documents
+    
+    Returns:
+        List of missions that were inserted
+    """
+    if not missions:
+        return []
+    
+    try:
+        db[MISSIONS_COLLECTION].insert_many(missions, ordered=False)
+        return missions
+    except BulkWriteError as e:
+        failed = {error['index'] for error in e.details.get('writeErrors', [])}
+        logger.error("❌ Failed to save %d of %d missions", len(failed), len(missions))
+        return [mission for i, mission in enumerate(missions) if i not in failed]
+
+
+def log_mission_created(mission, source_label):
+    """Print the dispatch summary for a saved mission."""
+    route = mission['routes'][0] if mission['routes'] else {}
+    distance_km = route.get('total_distance', 0) / 1000
+    route_type = "🛣️ road-snapped" if route.get('is_road_snapped') else "📏 straight-line"
+    logger.info("✅ Mission %s created (%s)", mission['_id'], source_label)
+    logger.info("   🚗 %s unit dispatched, %.2f km (%s)", mission['station']['type'].upper(), distance_km, route_type)
+
+
+def watch_for_work(db, wake_event, stream_open):
+    """
+    Wake the main loop as soon as a report or need becomes dispatchable.
+    
+    Opens a database-level change stream filtered to analyzed reports and
+    verified needs that are not yet assigned, and sets wake_event for each
+    matching change. The poll query remains the source of truth (and picks
+    up anything that changed while the agent was down), so the stream only
+    has to signal, not deliver documents.
+    
+    Change streams require a replica set; on a standalone server this
+    returns immediately and the loop keeps polling on its interval.
+    
+    Args:
+        db: MongoDB database instance
+        wake_event: threading.Event waited on by the main loop
+        stream_open: threading.Event set while the change stream is open
+    """
+    pipeline = [{
+        '$match': {
+            'operationType': {'$in': ['insert', 'update', 'replace']},
+            'fullDocument.dispatch_status': {'$nin': ['Assigned', 'Processing']},
+            # Skip the agent's own claim releases
+            'updateDescription.removedFields': {'$ne': 'claim_token'},
+            '$or': [
+                {
+                    'ns.coll': REPORTS_COLLECTION,
+                    'fullDocument.status': {'$in': ['Analyzed_Full', 'Analyzed']},
+                    'fullDocument.oracleData.severity': {'$gt': SEVERITY_THRESHOLD},
+                },
+                {
+                    'ns.coll': NEEDS_COLLECTION,
+                    'fullDocument.status': 'Verified',
+                },
+            ],
         }
-    )
+    }]
+    resume_token = None
     
-    return mission_id
+    while True:
+        try:
+            with db.watch(
+                pipeline,
+                full_document='updateLookup',
+                resume_after=resume_token,
+                max_await_time_ms=1000,
+                batch_size=100,
+            ) as stream:
+                stream_open.set()
+                logger.info("👂 Change stream open, dispatching on new reports/needs")
+                for change in stream:
+                    resume_token = stream.resume_token
+                    wake_event.set()
+        except OperationFailure as e:
+            # 40573: $changeStream is only supported on replica sets
+            if e.code == 40573:
+                logger.info("ℹ️ Change streams unavailable (standalone MongoDB), polling only")
+                return
+            logger.warning("⚠️ Change stream error: %s", e)
+        except PyMongoError as e:
+            logger.warning("⚠️ Change stream error: %s", e)
+        
+        # Until the stream reopens the loop must not sit on a long idle
+        # interval; wake it so it drops back to the base poll interval
+        stream_open.clear()
+        wake_event.set()
+        time.sleep(CHANGE_STREAM_RETRY_SECONDS)
 
 
 def run_logistics_agent():
@@ -689,9 +1920,9 @@ def run_logistics_agent():
     
     Generates optimized rescue routes from appropriate resource stations for both.
     """
-    print("[Logistics] 🚀 Starting Multi-Station Logistics Agent...")
-    print("[Logistics] 📊 Monitoring: Reports + Verified Needs")
-    print(f"[Logistics] 📡 Connecting to MongoDB at {MONGO_URI}")
+    logger.info("🚀 Starting Multi-Station Logistics Agent...")
+    logger.info("📊 Monitoring: Reports + Verified Needs")
+    logger.info("📡 Connecting to MongoDB at %s", MONGO_URI)
     
     try:
         client = MongoClient(MONGO_URI)
@@ -699,181 +1930,203 @@ def run_logistics_agent():
         
         # Test connection
         client.admin.command('ping')
-        print(f"[Logistics] ✅ Connected to database: {DATABASE_NAME}")
+        logger.info("✅ Connected to database: %s", DATABASE_NAME)
         
     except Exception as e:
-        print(f"[Logistics] ❌ Failed to connect to MongoDB: {e}")
+        logger.error("❌ Failed to connect to MongoDB: %s", e)
         return
     
     # Print registered stations from database
-    print(f"[Logistics] 🏥 Loading Registered Stations from Database...")
+    logger.info("🏥 Loading Registered Stations from Database...")
     registered_stations = get_registered_stations(db)
     total_stations = sum(len(stations) for stations in registered_stations.values())
     
     if total_stations == 0:
-        print(f"[Logistics] ⚠️ No registered stations found! Please register stations at /emergency-stations")
+        logger.warning("⚠️ No registered stations found! Please register stations at /emergency-stations")
     else:
         for station_type, stations in registered_stations.items():
             for s in stations:
-                print(f"[Logistics]    {station_type.upper()}: {s['name']} ({s.get('lat', 'N/A')}, {s.get('lon', 'N/A')})")
-        print(f"[Logistics] ✅ Loaded {total_stations} registered stations")
+                logger.info("   %s: %s (%s, %s)", station_type.upper(), s['name'], s.get('lat', 'N/A'), s.get('lon', 'N/A'))
+        logger.info("✅ Loaded %d registered stations", total_stations)
     
-    print(f"[Logistics] 🔄 Polling every {POLL_INTERVAL_SECONDS} seconds...")
-    print("-" * 60)
+    logger.info("🔄 Polling every %s seconds (adaptive %s-%ss)...", POLL_INTERVAL_SECONDS, MIN_POLL_INTERVAL_SECONDS, MAX_POLL_INTERVAL_SECONDS)
+    logger.info("-" * 60)
+    
+    # Keep OSRM routes cached across restarts
+    enable_route_cache_store(db)
+    
+    poll_interval = POLL_INTERVAL_SECONDS
+    executor = ThreadPoolExecutor(max_workers=OSRM_MAX_WORKERS, thread_name_prefix="osrm")
+    
+    # Push-based wake-ups; the poll interval remains as a backstop
+    wake_event = threading.Event()
+    stream_open = threading.Event()
+    threading.Thread(
+        target=watch_for_work,
+        args=(db, wake_event, stream_open),
+        name="change-stream",
+        daemon=True,
+    ).start()
     
     while True:
+        found_work = False
+        # One timestamp for everything dispatched in this cycle
+        cycle_now = datetime.now(timezone.utc)
+        # Items are claimed under this token until dispatched or released
+        claim_token = ObjectId()
+        has_unsaved_claims = True
+        
         try:
+            # Missions are collected across both parts and saved together
+            report_missions = []
+            need_missions = []
+            
             # ========================================
-            # PART 1: Process analyzed reports
+            # PART 1: Plan dispatches for reports and verified needs
             # ========================================
-            reports = get_critical_reports(db)
+            reports = get_critical_reports(db, claim_token, cycle_now)
             num_reports = len(reports)
+            verified_needs = get_verified_needs(db, claim_token, cycle_now)
+            num_needs = len(verified_needs)
             
+            report_plans = []
             if num_reports >= MIN_CLUSTER_SIZE:
-                print(f"[Logistics] 🚚 Processing {num_reports} reports...")
+                logger.info("🚚 Processing %d reports...", num_reports)
                 
                 for report in reports:
                     try:
-                        # Get report location
-                        if 'location' not in report or 'lat' not in report['location']:
-                            print(f"[Logistics] ⚠️ Report {report.get('reportId', report['_id'])} has no location. Skipping...")
-                            continue
-                        
-                        report_lat = report['location']['lat']
-                        report_lng = report['location']['lng']
-                        report_id = report['_id']
-                        report_uuid = report.get('reportId', str(report_id))
-                        
-                        # Determine which type of station should respond
-                        station_type = determine_station_type(report)
-                        
-                        assigned_station = find_registered_station(
-                            db,
-                            get_preassigned_station(report),
-                        )
-                        if assigned_station:
-                            station = assigned_station
-                        else:
-                            station = get_nearest_station(db, report_lat, report_lng, station_type)
-                        
-                        print(f"[Logistics] 📍 Report: {report_uuid}")
-                        print(f"[Logistics]    Need type: {station_type.upper()}")
-                        print(f"[Logistics]    Dispatching from: {station['name']}")
-                        
-                        # Create route: Station -> Report Location using OSRM
-                        depot_location = (station['lat'], station['lon'])
-                        report_location = (report_lat, report_lng)
-                        
-                        # Get road-snapped route from OSRM
-                        route = get_route_with_fallback(
-                            depot_location, 
-                            report_location, 
-                            station_type, 
-                            station['name']
-                        )
-                        routes = [route]
-                        
-                        # Save mission
-                        station_info = {
-                            'type': station_type,
-                            'name': station['name'],
-                            'lat': station['lat'],
-                            'lon': station['lon'],
-                        }
-                        mission_id = save_mission(db, routes, [report_id], station_info)
-                        
-                        # Log success
-                        distance_km = routes[0]['total_distance'] / 1000 if routes else 0
-                        route_type = "🛣️ road-snapped" if route.get('is_road_snapped') else "📏 straight-line"
-                        print(f"[Logistics] ✅ Mission {mission_id} created (Report)")
-                        print(f"[Logistics]    🚗 {station_type.upper()} unit dispatched, {distance_km:.2f} km ({route_type})")
-                        
+                        plan = build_report_plan(db, report)
                     except Exception as e:
-                        print(f"[Logistics] ❌ Error processing report: {e}")
+                        logger.error("❌ Error processing report: %s", e)
                         continue
+                    if plan:
+                        report_plans.append(plan)
             
-            # ========================================
-            # PART 2: Process verified needs (volunteer verified tasks)
-            # ========================================
-            verified_needs = get_verified_needs(db)
-            num_needs = len(verified_needs)
-            
+            need_plans = []
             if num_needs >= MIN_CLUSTER_SIZE:
-                print(f"[Logistics] 📋 Processing {num_needs} verified needs...")
+                logger.info("📋 Processing %d verified needs...", num_needs)
                 
                 for need in verified_needs:
                     try:
-                        # Get need location
-                        coords = need.get('coordinates', {})
-                        if not coords.get('lat') or not coords.get('lng'):
-                            print(f"[Logistics] ⚠️ Need {need['_id']} has no coordinates. Skipping...")
-                            continue
-                        
-                        need_lat = coords['lat']
-                        need_lon = coords['lng']
-                        need_id = need['_id']
-                        
-                        # Determine which type of station should respond
-                        station_type = determine_station_type_for_need(need)
-                        
-                        assigned_station = find_registered_station(
-                            db,
-                            get_preassigned_station(need),
-                        )
-                        if assigned_station:
-                            station = assigned_station
-                        else:
-                            station = get_nearest_station(db, need_lat, need_lon, station_type)
-                        
-                        need_type = need.get('triageData', {}).get('needType', 'Unknown')
-                        print(f"[Logistics] 📋 Verified Need: {need_id}")
-                        print(f"[Logistics]    Type: {need_type}")
-                        print(f"[Logistics]    Station type: {station_type.upper()}")
-                        print(f"[Logistics]    Dispatching from: {station['name']}")
-                        
-                        # Create route: Station -> Need Location using OSRM
-                        depot_location = (station['lat'], station['lon'])
-                        need_location = (need_lat, need_lon)
-                        
-                        # Get road-snapped route from OSRM
-                        route = get_route_with_fallback(
-                            depot_location, 
-                            need_location, 
-                            station_type, 
-                            station['name']
-                        )
-                        routes = [route]
-                        
-                        # Save mission for verified need
-                        station_info = {
-                            'type': station_type,
-                            'name': station['name'],
-                            'lat': station['lat'],
-                            'lon': station['lon'],
-                        }
-                        mission_id = save_need_mission(db, routes, [need_id], station_info)
-                        
-                        # Log success
-                        distance_km = routes[0]['total_distance'] / 1000 if routes else 0
-                        route_type = "🛣️ road-snapped" if route.get('is_road_snapped') else "📏 straight-line"
-                        print(f"[Logistics] ✅ Mission {mission_id} created (Verified Need)")
-                        print(f"[Logistics]    🚗 {station_type.upper()} unit dispatched, {distance_km:.2f} km ({route_type})")
-                        
+                        plan = build_need_plan(db, need)
                     except Exception as e:
-                        print(f"[Logistics] ❌ Error processing verified need: {e}")
+                        logger.error("❌ Error processing verified need: %s", e)
                         continue
+                    if plan:
+                        need_plans.append(plan)
+            
+            # Resolve nearest stations for every plan in one batch, then fetch
+            # all routes of the cycle concurrently instead of one OSRM
+            # round-trip after another
+            plans = report_plans + need_plans
+            assign_nearest_stations(db, plans, executor)
+            route_futures = [executor.submit(route_plan, plan) for plan in plans]
+            report_futures = route_futures[:len(report_plans)]
+            need_futures = route_futures[len(report_plans):]
+            
+            # ========================================
+            # PART 2: Build missions from the fetched routes
+            # ========================================
+            for plan, route_future in zip(report_plans, report_futures):
+                try:
+                    report = plan['item']
+                    report_id = report['_id']
+                    report_uuid = report.get('reportId', str(report_id))
+                    station_type = plan['station_type']
+                    station = plan['station']
+                    
+                    logger.info("📍 Report: %s", report_uuid)
+                    logger.info("   Need type: %s", station_type.upper())
+                    logger.info("   Dispatching from: %s", station['name'])
+                    
+                    # Road-snapped route from OSRM (fetched concurrently above)
+                    route = route_future.result()
+                    routes = [route]
+                    
+                    # Queue mission for the batched save below
+                    report_missions.append(
+                        build_mission(routes, [report_id], plan_station_info(plan), cycle_now)
+                    )
+                    
+                except Exception as e:
+                    logger.error("❌ Error processing report: %s", e)
+                    continue
+            
+            for plan, route_future in zip(need_plans, need_futures):
+                try:
+                    need = plan['item']
+                    need_id = need['_id']
+                    station_type = plan['station_type']
+                    station = plan['station']
+                    
+                    need_type = need.get('triageData', {}).get('needType', 'Unknown')
+                    logger.info("📋 Verified Need: %s", need_id)
+                    logger.info("   Type: %s", need_type)
+                    logger.info("   Station type: %s", station_type.upper())
+                    logger.info("   Dispatching from: %s", station['name'])
+                    
+                    # Road-snapped route from OSRM (fetched concurrently above)
+                    route = route_future.result()
+                    routes = [route]
+                    
+                    # Queue mission for the batched save below
+                    need_missions.append(
+                        build_need_mission(routes, [need_id], plan_station_info(plan), cycle_now)
+                    )
+                    
+                except Exception as e:
+                    logger.error("❌ Error processing verified need: %s", e)
+                    continue
+            
+            # ========================================
+            # PART 3: Save this cycle's missions in one batch
+            # ========================================
+            saved_report_missions, saved_need_missions = save_missions(
+                db, report_missions, need_missions, claim_token, cycle_now
+            )
+            for mission in saved_report_missions:
+                log_mission_created(mission, "Report")
+            for mission in saved_need_missions:
+                log_mission_created(mission, "Verified Need")
+            
+            # Only dispatched work counts as activity; items that keep being
+            # skipped (e.g. missing location) must not pin the fast interval
+            found_work = bool(saved_report_missions or saved_need_missions)
+            has_unsaved_claims = (
+                len(saved_report_missions) < num_reports
+                or len(saved_need_missions) < num_needs
+            )
             
             # Log status if nothing to process
             if num_reports < MIN_CLUSTER_SIZE and num_needs < MIN_CLUSTER_SIZE:
-                print(f"[Logistics] 🔍 Found {num_reports} reports, {num_needs} verified needs. Waiting...")
+                logger.info("🔍 Found %d reports, %d verified needs. Waiting...", num_reports, num_needs)
             
-            print("-" * 60)
+            logger.info("-" * 60)
             
         except Exception as e:
-            print(f"[Logistics] ❌ Error in agent loop: {e}")
+            logger.error("❌ Error in agent loop: %s", e)
+        
+        # Hand skipped/failed items back so the next cycle can retry them
+        if has_unsaved_claims:
+            release_claims(db, claim_token)
+        
+        # Adaptive backoff: activity drops straight back below the base
+        # interval, idle cycles back off exponentially - past the base
+        # interval only while the change stream can wake the loop early
+        if found_work:
+            poll_interval = max(
+                MIN_POLL_INTERVAL_SECONDS,
+                min(poll_interval, POLL_INTERVAL_SECONDS) * 0.5,
+            )
+        else:
+            idle_ceiling = MAX_POLL_INTERVAL_SECONDS if stream_open.is_set() else POLL_INTERVAL_SECONDS
+            poll_interval = min(idle_ceiling, poll_interval * 2)
         
-        time.sleep(POLL_INTERVAL_SECONDS)
+        # Sleep until the next poll, or until the change stream reports new work
+        wake_event.wait(poll_interval)
+        wake_event.clear()
 
 
 if __name__ == "__main__":
+    configure_logging()
     run_logistics_agent()
@@ -27,9 +27,18 @@
 # 5. Print logs to the console like "[Sentinel] Processing Report ID..."
 
 # Start coding the imports and the main loop below:
+import atexit
+import hashlib
+import logging
+import logging.handlers
 import os
+import queue
+import sys
+import threading
 import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
 
@@ -44,9 +53,11 @@ import requests
 import tensorflow as tf
 from dotenv import load_dotenv
 from PIL import Image
-from pymongo import MongoClient, ReturnDocument
-from pymongo.errors import ConfigurationError
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import ConfigurationError, OperationFailure, PyMongoError
+from requests.adapters import HTTPAdapter
 from tensorflow.keras.models import load_model
+from urllib3.util.retry import Retry
 
 # Resolve project paths and load environment variables
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -68,12 +79,67 @@ MODEL_PATH = os.getenv(
     "SENTINEL_MODEL_PATH",
     str(BASE_DIR / "models" / "disaster_model.keras"),
 )
+# Logging — records go to stdout because the backend relays agent stderr as
+# errors. SENTINEL_LOG_LEVEL=DEBUG adds per-report progress lines.
+LOG_LEVEL = os.getenv("SENTINEL_LOG_LEVEL", "INFO").upper()
+logger = logging.getLogger("sentinel")
+
+# Inference backend: "keras" (FP32 graph), "savedmodel" (exported serving
+# signature) or "tflite" (quantized weights)
+INFERENCE_BACKEND = os.getenv("SENTINEL_BACKEND", "keras").lower()
+TFLITE_MODEL_PATH = os.getenv(
+    "SENTINEL_TFLITE_PATH",
+    str(Path(MODEL_PATH).with_suffix(".tflite")),
+)
+SAVED_MODEL_DIR = os.getenv(
+    "SENTINEL_SAVED_MODEL_DIR",
+    str(Path(MODEL_PATH).with_suffix("")) + "_savedmodel",
+)
+# TF thread pools; the download pool and the other agents share the host,
+# so by default inference takes half the cores and runs one op graph at a time
+INTRA_OP_THREADS = int(os.getenv("SENTINEL_INTRA_THREADS", max(1, (os.cpu_count() or 2) // 2)))
+INTER_OP_THREADS = int(os.getenv("SENTINEL_INTER_THREADS", 1))
+# Optional CPU list to pin the process to, e.g. "0-3" or "0,2,4,6" (Linux only)
+CPU_AFFINITY = os.getenv("SENTINEL_CPU_AFFINITY", "")
 POLL_INTERVAL = int(os.getenv("SENTINEL_POLL_INTERVAL", 2))  # seconds
 RUN_ONCE = os.getenv("SENTINEL_RUN_ONCE", "false").lower() in {"1", "true", "yes"}
 MAX_CYCLES = int(os.getenv("SENTINEL_MAX_CYCLES", 0))  # 0 = infinite
+BATCH_SIZE = max(1, int(os.getenv("SENTINEL_BATCH_SIZE", 8)))  # reports per predict call
+IMAGE_SIZE = (224, 224)
+# uint8 pixel value -> normalized float32, so normalizing is a single gather
+PIXEL_LUT = np.arange(256, dtype=np.float32) / np.float32(255.0)
+CHANGE_STREAM_RETRY_SECONDS = 5  # Delay before reopening a failed change stream
+DOWNLOAD_TIMEOUT = (3, 10)  # (connect, read) seconds
+MAX_IMAGE_BYTES = int(os.getenv("SENTINEL_MAX_IMAGE_BYTES", 10 * 1024 * 1024))
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+GENERIC_CONTENT_TYPE = "application/octet-stream"
+# Preprocessed pixels for recently seen image URLs (~600 KB per entry). The
+# lookup is by URL before fetching, so reports repeating an exact URL skip
+# the download, decode and resize
+IMAGE_CACHE_SIZE = int(os.getenv("SENTINEL_IMAGE_CACHE_SIZE", 128))
+DOWNLOAD_WORKERS = max(1, int(os.getenv("SENTINEL_DOWNLOAD_WORKERS", 16)))
+
+# Shared HTTP session so image downloads reuse pooled keep-alive connections
+# instead of paying a TCP/TLS handshake per report. Transient gateway
+# errors from the image host are retried with a short backoff.
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=max(DOWNLOAD_WORKERS, 8),
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET", "HEAD"],
+    ),
+)
+_http_session.mount("https://", _http_adapter)
+_http_session.mount("http://", _http_adapter)
+_http_session.headers.update({"User-Agent": "AegisSentinel/1.0"})
 
 # Class names for disaster classification (binary: disaster vs non-disaster)
 CLASS_NAMES = ['Non-Disaster', 'Disaster']
+CLASS_NAMES_ARRAY = np.array(CLASS_NAMES, dtype=object)
 
 
 @tf.keras.utils.register_keras_serializable(package="Custom")
@@ -120,107 +186,421 @@ client = None
 db = None
 collection = None
 model = None
+infer = None
+executor = None
+
+# LRU of image-URL digest -> preprocessed (224, 224, 3) float32 pixels.
+# Only touched from the main loop, so it needs no lock.
+_image_cache = OrderedDict()
+
+
+def configure_logging():
+    """
+    Send agent log records to stdout with the [Sentinel] prefix.
+
+    Records are handed to a queue and written by a background listener
+    thread, so the classification loop never blocks on the stdout write.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[Sentinel] %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+
+    # getLevelName maps known names to their number; anything else is a typo
+    level = logging.getLevelName(LOG_LEVEL)
+    if isinstance(level, int):
+        logger.setLevel(level)
+    else:
+        logger.setLevel(logging.INFO)
+        logger.warning("Unknown SENTINEL_LOG_LEVEL %r, using INFO", LOG_LEVEL)
 
 
 def download_image(image_url):
-    """Download image from URL and return PIL Image object."""
-    response = requests.get(image_url, timeout=10)
-    response.raise_for_status()
-    image = Image.open(BytesIO(response.content))
+    """
+    Download and decode an image, returning a loaded PIL Image.
+
+    Responses whose Content-Type is clearly not an image are rejected before
+    any of the body is read. The body is streamed and the download is aborted
+    as soon as it exceeds MAX_IMAGE_BYTES, whether or not the server declared
+    a Content-Length.
+    JPEGs are decoded at the smallest DCT scale that still covers the model
+    input, which skips most of the decode work for large photos.
+    """
+    with _http_session.get(image_url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        # Reject pages and other non-image bodies from the headers alone; a
+        # missing or generic binary type is still given to the decoder
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and not content_type.startswith('image/') and content_type != GENERIC_CONTENT_TYPE:
+            raise ValueError(f'Non-image content type: {content_type}')
+
+        declared = int(response.headers.get('Content-Length') or 0)
+        if declared > MAX_IMAGE_BYTES:
+            raise ValueError(f'Image too large ({declared} bytes)')
+
+        # Accumulate straight into the buffer PIL decodes from, so the body
+        # is never copied a second time
+        body = BytesIO()
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+            body.write(chunk)
+            if body.tell() > MAX_IMAGE_BYTES:
+                raise ValueError(f'Image exceeds {MAX_IMAGE_BYTES} bytes')
+
+    body.seek(0)
+    image = Image.open(body)
+    image.draft('RGB', IMAGE_SIZE)
+    image.load()
     return image
 
 
-def preprocess_image(image):
-    """Preprocess image for model prediction."""
-    # Resize to (224, 224)
-    image = image.resize((224, 224))
+def fetch_image(image_url):
+    """Download an image, returning (image, None) or (None, error) for the batch."""
+    try:
+        return download_image(image_url), None
+    except Exception as e:
+        return None, e
+
+
+def image_cache_key(image_url):
+    """
+    Cache key for an image: the SHA-1 of the URL string, not of the image bytes.
+
+    Because it needs only the URL, the cache is checked before any download,
+    so a hit skips the network fetch as well as decode and resize. The digest
+    just keeps long URLs compact; URLs that differ in any way (e.g. query
+    parameters) are separate entries.
+    """
+    return hashlib.sha1(image_url.encode('utf-8')).digest()
+
+
+def get_cached_pixels(image_url):
+    """Return cached preprocessed pixels for a URL, or None; call before downloading."""
+    key = image_cache_key(image_url)
+    pixels = _image_cache.get(key)
+    if pixels is not None:
+        _image_cache.move_to_end(key)
+    return pixels
+
+
+def cache_pixels(image_url, pixels):
+    """Remember a copy of preprocessed pixels, evicting the least recent entry."""
+    if IMAGE_CACHE_SIZE <= 0:
+        return pixels
+    pixels = pixels.copy()
+    _image_cache[image_cache_key(image_url)] = pixels
+    if len(_image_cache) > IMAGE_CACHE_SIZE:
+        _image_cache.popitem(last=False)
+    return pixels
+
+
+def preprocess_image(image, out):
+    """Resize, convert and normalize an image into a (224, 224, 3) float32 slot."""
+    # Pin the filter so results don't drift with Pillow's default
+    image = image.resize(IMAGE_SIZE, Image.Resampling.BICUBIC)
     # Convert to RGB if necessary
     if image.mode != 'RGB':
         image = image.convert('RGB')
-    # Convert to numpy array
-    image_array = np.array(image)
-    # Normalize pixel values to [0, 1]
-    image_array = image_array / 255.0
-    # Add batch dimension
-    image_array = np.expand_dims(image_array, axis=0)
-    return image_array
-
-
-def classify_image(image_array):
-    """Run model prediction and return class name and confidence."""
-    predictions = model.predict(image_array, verbose=0)
-    
+    # Normalize to [0, 1] with one lookup pass straight into the slot
+    np.take(PIXEL_LUT, np.asarray(image), out=out)
+    return out
+
+
+def check_output_width(output_width):
+    """
+    Fail fast unless the model is a single sigmoid unit or matches CLASS_NAMES,
+    so postprocessing can index names without per-batch guards.
+    """
+    # None: an exported signature that leaves the class dimension unspecified
+    if output_width is not None and output_width not in (1, len(CLASS_NAMES)):
+        raise ValueError(
+            f"Model outputs {output_width} classes but CLASS_NAMES has {len(CLASS_NAMES)}"
+        )
+
+
+def select_classes(predictions):
+    """Reduce a batch of model output to (class_indices, confidences) arrays."""
     # Handle binary classification (single output neuron with sigmoid)
     if predictions.shape[-1] == 1:
-        # Single output: probability of being a disaster
-        disaster_prob = float(predictions[0][0])
-        if disaster_prob >= 0.5:
-            class_name = 'Disaster'
-            confidence = disaster_prob
-        else:
-            class_name = 'Non-Disaster'
-            confidence = 1.0 - disaster_prob
-    else:
-        # Multi-class output (softmax)
-        class_index = np.argmax(predictions[0])
-        confidence = float(predictions[0][class_index])
-        class_name = CLASS_NAMES[class_index] if class_index < len(CLASS_NAMES) else f'Class_{class_index}'
-    
-    return class_name, confidence
-
-
-def process_report(report):
-    """Process a single report: download image, classify, and update DB."""
-    report_id = report['_id']
-    image_url = report['imageUrl']
-    
-    print(f"[Sentinel] Processing Report ID: {report_id}")
-    print(f"[Sentinel] Image URL: {image_url}")
-    
-    try:
-        # Download the image
-        print(f"[Sentinel] Downloading image...")
-        image = download_image(image_url)
-        
-        # Preprocess the image
-        print(f"[Sentinel] Preprocessing image...")
-        image_array = preprocess_image(image)
-        
-        # Classify the image
-        print(f"[Sentinel] Running classification...")
-        class_name, confidence = classify_image(image_array)
-        
-        print(f"[Sentinel] Classification Result: {class_name} (Confidence: {confidence:.4f})")
-        
-        # Update the document with results
-        collection.update_one(
-            {'_id': report_id},
-            {
-                '$set': {
-                    'sentinelData': {
-                        'tag': class_name,
-                        'confidence': confidence
-                    },
-                    'status': 'Analyzed_Visual'
-                }
-            }
-        )
-        
-        print(f"[Sentinel] Report {report_id} processed successfully!")
-        
-    except requests.exceptions.RequestException as e:
-        print(f"[Sentinel] Error downloading image: {e}")
-        collection.update_one(
-            {'_id': report_id},
-            {'$set': {'status': 'Error', 'errorMessage': f'Image download failed: {str(e)}'}}
+        # Single output: probability of being a disaster; index 1 is 'Disaster'
+        disaster_prob = predictions[:, 0]
+        is_disaster = disaster_prob >= 0.5
+        return is_disaster.astype(np.intp), np.where(is_disaster, disaster_prob, 1.0 - disaster_prob)
+
+    # Multi-class output (softmax)
+    return predictions.argmax(axis=1), predictions.max(axis=1)
+
+
+def select_classes_tf(predictions):
+    """Graph version of select_classes, so only two small vectors leave the device."""
+    if predictions.shape[-1] == 1:
+        disaster_prob = predictions[:, 0]
+        is_disaster = disaster_prob >= 0.5
+        return (
+            tf.cast(is_disaster, tf.int32),
+            tf.where(is_disaster, disaster_prob, 1.0 - disaster_prob),
         )
-        
+
+    return tf.argmax(predictions, axis=1, output_type=tf.int32), tf.reduce_max(predictions, axis=1)
+
+
+def parse_cpu_list(spec):
+    """Parse a CPU list such as "0-3,6" into a set of core ids."""
+    cores = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition('-')
+        cores.update(range(int(start), int(end or start) + 1))
+    return cores
+
+
+def configure_tf_threading():
+    """Size TF's thread pools and optionally pin the process, before any op runs."""
+    if CPU_AFFINITY and hasattr(os, 'sched_setaffinity'):
+        cores = parse_cpu_list(CPU_AFFINITY)
+        os.sched_setaffinity(0, cores)
+        logger.info("Pinned to CPUs %s", sorted(cores))
+
+    tf.config.threading.set_intra_op_parallelism_threads(INTRA_OP_THREADS)
+    tf.config.threading.set_inter_op_parallelism_threads(INTER_OP_THREADS)
+
+
+def build_inference_fn(keras_model):
+    """
+    Trace the model's forward pass once into a concrete graph function.
+
+    Calling it skips model.predict's per-call dataset wrapping and callback
+    machinery; the unbounded batch dimension keeps a single trace for every
+    batch size. Thresholding/argmax runs inside the graph as well.
+    """
+    check_output_width(keras_model.output_shape[-1])
+    forward = tf.function(
+        lambda images: select_classes_tf(keras_model(images, training=False))
+    )
+    concrete = forward.get_concrete_function(
+        tf.TensorSpec((None, *IMAGE_SIZE, 3), tf.float32)
+    )
+
+    def infer_keras(batch):
+        class_indices, confidences = concrete(tf.constant(batch))
+        return class_indices.numpy(), confidences.numpy()
+
+    return infer_keras
+
+
+def convert_to_tflite(keras_model, output_path):
+    """
+    Write a TFLite copy of the Keras model with post-training quantization.
+
+    Optimize.DEFAULT without a representative dataset stores the weights as
+    INT8 and quantizes activations dynamically, so the interpreter still takes
+    and returns float32 and no calibration images are needed.
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    Path(output_path).write_bytes(converter.convert())
+
+
+def build_tflite_inference_fn(model_path):
+    """Load a TFLite model and return a batch -> (class_indices, confidences) callable."""
+    interpreter = tf.lite.Interpreter(
+        model_path=str(model_path),
+        num_threads=INTRA_OP_THREADS,
+    )
+    input_index = interpreter.get_input_details()[0]['index']
+    output_details = interpreter.get_output_details()[0]
+    output_index = output_details['index']
+    check_output_width(int(output_details['shape'][-1]))
+    allocated = {'input': None}
+
+    def infer_tflite(batch):
+        # TFLite tensors have a fixed shape; reallocate only when a batch is
+        # larger than any seen so far and zero-pad smaller ones into it
+        padded = allocated['input']
+        if padded is None or len(padded) < len(batch):
+            interpreter.resize_tensor_input(input_index, batch.shape)
+            interpreter.allocate_tensors()
+            padded = allocated['input'] = np.zeros(batch.shape, dtype=batch.dtype)
+        padded[:len(batch)] = batch
+        padded[len(batch):] = 0
+        interpreter.set_tensor(input_index, padded)
+        interpreter.invoke()
+        return select_classes(interpreter.get_tensor(output_index)[:len(batch)])
+
+    return infer_tflite
+
+
+def export_saved_model(keras_model, export_dir):
+    """
+    Export only the inference graph as a SavedModel serving signature.
+
+    The saved root is a bare tf.Module holding only the model's weights and
+    the serve function, rather than the Keras model itself, so optimizer
+    slots and CustomF1Score metric variables are not written and loading it
+    does not need CustomF1Score.
+    """
+    export = tf.Module()
+    export.model_weights = list(keras_model.weights)
+    export.serve = tf.function(
+        lambda images: {'predictions': keras_model(images, training=False)},
+        input_signature=[tf.TensorSpec((None, *IMAGE_SIZE, 3), tf.float32, name='images')],
+    )
+    tf.saved_model.save(
+        export,
+        str(export_dir),
+        signatures={'serving_default': export.serve.get_concrete_function()},
+    )
+
+
+def build_saved_model_inference_fn(export_dir):
+    """Load a SavedModel and return a batch -> (class_indices, confidences) callable."""
+    loaded = tf.saved_model.load(str(export_dir))
+    signature = loaded.signatures['serving_default']
+    # Signatures take and return named tensors; the model has one of each
+    input_name = next(iter(signature.structured_input_signature[1]))
+    output_name = next(iter(signature.structured_outputs))
+    check_output_width(signature.structured_outputs[output_name].shape[-1])
+
+    def infer_saved_model(batch, _loaded=loaded):
+        # _loaded keeps the restored variables alive for the signature
+        outputs = signature(**{input_name: tf.constant(batch)})
+        return select_classes(outputs[output_name].numpy())
+
+    return infer_saved_model
+
+
+def load_inference_fn():
+    """Load the model for the configured backend and return its inference callable."""
+    global model
+
+    if INFERENCE_BACKEND == "tflite":
+        if not Path(TFLITE_MODEL_PATH).exists():
+            logger.info("Converting model to TFLite: %s", TFLITE_MODEL_PATH)
+            model = load_model(MODEL_PATH)
+            convert_to_tflite(model, TFLITE_MODEL_PATH)
+        return build_tflite_inference_fn(TFLITE_MODEL_PATH)
+
+    if INFERENCE_BACKEND == "savedmodel":
+        if not Path(SAVED_MODEL_DIR).exists():
+            logger.info("Exporting SavedModel serving signature: %s", SAVED_MODEL_DIR)
+            model = load_model(MODEL_PATH)
+            export_saved_model(model, SAVED_MODEL_DIR)
+        return build_saved_model_inference_fn(SAVED_MODEL_DIR)
+
+    model = load_model(MODEL_PATH)
+    return build_inference_fn(model)
+
+
+def warm_up(infer_fn, rounds=2):
+    """Run dummy full batches so graph tracing and kernel setup happen before serving."""
+    dummy = np.zeros((BATCH_SIZE, *IMAGE_SIZE, 3), dtype=np.float32)
+    for _ in range(rounds):
+        infer_fn(dummy)
+
+
+def classify_batch(batch):
+    """Run one model prediction over a stacked batch, returning names and confidences."""
+    class_indices, confidences = infer(batch)
+    # tolist() yields plain Python str/float values, which BSON can encode
+    return CLASS_NAMES_ARRAY[class_indices].tolist(), confidences.tolist()
+
+
+def build_error_op(report_id, message):
+    """Build the update that flags a report as not analyzable."""
+    return UpdateOne(
+        {'_id': report_id},
+        {'$set': {'status': 'Error', 'errorMessage': message}}
+    )
+
+
+def build_result_op(report_id, class_name, confidence):
+    """Build the update that stores a report's classification."""
+    return UpdateOne(
+        {'_id': report_id},
+        {
+            '$set': {
+                'sentinelData': {
+                    'tag': class_name,
+                    'confidence': confidence
+                },
+                'status': 'Analyzed_Visual'
+            }
+        }
+    )
+
+
+def classify_reports(reports):
+    """Download and classify a batch of reports, returning their DB updates."""
+    batch = np.empty((len(reports), *IMAGE_SIZE, 3), dtype=np.float32)
+    ready = []
+    ops = []
+
+    # Serve repeated URLs from the cache and download each remaining URL once,
+    # overlapping the I/O-bound fetches across the worker pool
+    image_urls = [report['imageUrl'] for report in reports]
+    cached = {url: get_cached_pixels(url) for url in image_urls}
+    missing = [url for url, pixels in cached.items() if pixels is None]
+    fetched = dict(zip(missing, executor.map(fetch_image, missing)))
+
+    for report, image_url in zip(reports, image_urls):
+        report_id = report['_id']
+
+        logger.debug("Processing report %s (%s)", report_id, image_url)
+
+        try:
+            pixels = cached[image_url]
+            if pixels is not None:
+                batch[len(ready)] = pixels
+            else:
+                image, error = fetched[image_url]
+                if error is not None:
+                    raise error
+                # Preprocess straight into the batch slot
+                slot = preprocess_image(image, batch[len(ready)])
+                cached[image_url] = cache_pixels(image_url, slot)
+            ready.append(report_id)
+
+        except requests.exceptions.RequestException as e:
+            logger.warning("Report %s: image download failed: %s", report_id, e)
+            ops.append(build_error_op(report_id, f'Image download failed: {str(e)}'))
+
+        except Exception as e:
+            logger.warning("Report %s: error processing image: %s", report_id, e)
+            ops.append(build_error_op(report_id, str(e)))
+
+    if not ready:
+        return ops
+
+    try:
+        logger.debug("Running classification on %d image(s)", len(ready))
+        class_names, confidences = classify_batch(batch[:len(ready)])
     except Exception as e:
-        print(f"[Sentinel] Error processing report: {e}")
-        collection.update_one(
-            {'_id': report_id},
-            {'$set': {'status': 'Error', 'errorMessage': str(e)}}
-        )
+        logger.exception("Error running classification")
+        return ops + [build_error_op(report_id, str(e)) for report_id in ready]
+
+    for report_id, class_name, confidence in zip(ready, class_names, confidences):
+        logger.info("Report %s: %s (confidence %.4f)", report_id, class_name, confidence)
+        ops.append(build_result_op(report_id, class_name, confidence))
+
+    return ops
+
+
+def process_reports(reports):
+    """Process a batch of reports and write every outcome in one round-trip."""
+    ops = classify_reports(reports)
+    if not ops:
+        return
+
+    # Each op targets a distinct report, so the server may apply them in any order
+    result = collection.bulk_write(ops, ordered=False)
+    logger.debug("%d report(s) updated", result.modified_count)
 
 
 def find_and_lock_pending_report():
@@ -236,17 +616,71 @@ def find_and_lock_pending_report():
         {
             '$set': {'status': 'Processing_Visual'}
         },
+        sort=[('createdAt', 1)],  # Oldest first, served by the partial Pending index
         return_document=ReturnDocument.AFTER  # Return the locked document
     )
     return report
 
 
+def find_and_lock_pending_reports(limit=BATCH_SIZE):
+    """Lock up to `limit` pending reports, one atomic claim per document."""
+    reports = []
+    while len(reports) < limit:
+        report = find_and_lock_pending_report()
+        if report is None:
+            break
+        reports.append(report)
+    return reports
+
+
+def watch_for_reports(collection, wake_event):
+    """
+    Wake the main loop as soon as a pending report with an image appears.
+
+    The claim query stays the source of truth, so the change stream only
+    signals; reports created while the agent was down are picked up by the
+    first sweep. On a standalone MongoDB (no replica set) change streams are
+    unavailable and the loop falls back to polling every POLL_INTERVAL.
+    """
+    pipeline = [{
+        '$match': {
+            'operationType': {'$in': ['insert', 'update', 'replace']},
+            'fullDocument.status': 'Pending',
+            'fullDocument.imageUrl': {'$ne': None},
+        }
+    }]
+    resume_token = None
+
+    while True:
+        try:
+            with collection.watch(
+                pipeline,
+                full_document='updateLookup',
+                resume_after=resume_token,
+                max_await_time_ms=1000,
+            ) as stream:
+                logger.info("👂 Change stream open, waking on new reports")
+                for change in stream:
+                    resume_token = stream.resume_token
+                    wake_event.set()
+        except OperationFailure as e:
+            # 40573: $changeStream is only supported on replica sets
+            if e.code == 40573:
+                logger.info("Change streams unavailable (standalone MongoDB), polling only")
+                return
+            logger.warning("Change stream error: %s", e)
+        except PyMongoError as e:
+            logger.warning("Change stream error: %s", e)
+
+        time.sleep(CHANGE_STREAM_RETRY_SECONDS)
+
+
 def main():
-    """Main loop: continuously poll database for pending reports."""
-    global client, db, collection, model
+    """Main loop: claim pending reports as change events or polls surface them."""
+    global client, db, collection, infer, executor
 
     # Connect to MongoDB
-    print("[Sentinel] Connecting to MongoDB...")
+    logger.info("Connecting to MongoDB...")
     client = MongoClient(MONGO_URI)
 
     if MONGO_DB_NAME:
@@ -258,52 +692,71 @@ def main():
             db = client["DisasterResponseDB"]
 
     collection = db[COLLECTION_NAME]
-    print(
-        f"[Sentinel] Connected to MongoDB '{db.name}' collection '{COLLECTION_NAME}' successfully!"
-    )
+    logger.info("Connected to MongoDB '%s' collection '%s' successfully!", db.name, COLLECTION_NAME)
 
     # Load the TensorFlow model
-    print("[Sentinel] Loading disaster classification model...")
-    model = load_model(MODEL_PATH)
-    print("[Sentinel] Model loaded successfully!")
-
-    print("[Sentinel] Starting Sentinel Agent...")
-    print(f"[Sentinel] Polling interval: {POLL_INTERVAL} seconds")
-    print("[Sentinel] Watching for pending reports with images...")
-    print("-" * 50)
+    configure_tf_threading()
+    logger.info("Loading disaster classification model (%s backend)...", INFERENCE_BACKEND)
+    infer = load_inference_fn()
+    logger.info("Model loaded successfully!")
+    warm_up(infer)
+    logger.info("Warmup complete")
+
+    executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="download")
+
+    logger.info("Starting Sentinel Agent...")
+    logger.info("Polling interval: %s seconds", POLL_INTERVAL)
+    logger.info("Batch size: %s reports", BATCH_SIZE)
+    logger.info("Watching for pending reports with images...")
+    logger.info("-" * 50)
+
+    wake_event = threading.Event()
+    threading.Thread(
+        target=watch_for_reports,
+        args=(collection, wake_event),
+        name="sentinel-change-stream",
+        daemon=True,
+    ).start()
 
     cycle_count = 0
 
     while True:
         try:
-            # Find and atomically lock a pending report
-            report = find_and_lock_pending_report()
-            
-            if report:
-                process_report(report)
-                print("-" * 50)
+            # Clear before querying so a report inserted mid-sweep still wakes us
+            wake_event.clear()
+            # Find and atomically lock a batch of pending reports
+            reports = find_and_lock_pending_reports()
+
+            if reports:
+                process_reports(reports)
             else:
                 # No pending reports, wait before polling again
-                print("[Sentinel] 👁️ No pending visual reports found. Waiting...")
-                
+                logger.debug("👁️ No pending visual reports found. Waiting...")
+
         except Exception as e:
-            print(f"[Sentinel] Unexpected error in main loop: {e}")
-        
-        # Wait before next poll
-        time.sleep(POLL_INTERVAL)
+            reports = None
+            logger.exception("Unexpected error in main loop: %s", e)
+
+        # A full batch may mean more are queued; otherwise sleep until the
+        # change stream signals a new report or the poll interval elapses
+        if not reports or len(reports) < BATCH_SIZE:
+            wake_event.wait(POLL_INTERVAL)
 
         cycle_count += 1
         if RUN_ONCE or (MAX_CYCLES and cycle_count >= MAX_CYCLES):
-            print("[Sentinel] Reached configured cycle limit. Exiting main loop.")
+            logger.info("Reached configured cycle limit. Exiting main loop.")
             break
 
 
 if __name__ == "__main__":
+    configure_logging()
     try:
         main()
     except KeyboardInterrupt:
-        print("\n[Sentinel] Shutting down gracefully...")
+        logger.info("Shutting down gracefully...")
     finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
         if client is not None:
             client.close()
-            print("[Sentinel] Disconnected from MongoDB. Goodbye!")
+            logger.info("Disconnected from MongoDB. Goodbye!")
@@ -57,6 +57,11 @@ export const config = {
       process.env.GEOCODE_DEFAULT_REGION || GEOCODE_DEFAULTS.REGION,
     timeout: GEOCODE_DEFAULTS.TIMEOUT,
   },
+
+  // Routing (shared with the Python logistics agent)
+  osrm: {
+    baseUrl: process.env.OSRM_BASE_URL || "https://router.project-osrm.org",
+  },
 };
 
 export default config;
@@ -92,9 +92,21 @@ const NeedSchema = new mongoose.Schema(
      */
     dispatch_status: {
       type: String,
-      enum: ["Pending", "Unassigned", "Assigned"],
+      enum: ["Pending", "Unassigned", "Processing", "Assigned"],
       default: "Unassigned",
     },
+    // Set while the logistics agent holds a dispatch claim on the document
+    claim_token: {
+      type: mongoose.Schema.Types.ObjectId,
+    },
+    claimed_at: {
+      type: Date,
+    },
+    // dispatch_status to restore if the claim is released undispatched
+    claimed_from: {
+      type: String,
+      enum: ["Pending", "Unassigned"],
+    },
     mission_id: {
       type: mongoose.Schema.Types.ObjectId,
     },
@@ -160,6 +172,8 @@ const NeedSchema = new mongoose.Schema(
 
 // Indexes for common queries
 NeedSchema.index({ status: 1, createdAt: -1 });
+// Logistics agent dispatch query (verified, undispatched)
+NeedSchema.index({ status: 1, dispatch_status: 1 });
 NeedSchema.index({ fromNumber: 1, status: 1 });
 NeedSchema.index({ "coordinates.lat": 1, "coordinates.lng": 1 });
 NeedSchema.index({ emergencyStatus: 1 });
@@ -135,9 +135,21 @@ const reportSchema = new mongoose.Schema(
     // Dispatch tracking (set by logistics agent via pymongo and reroute endpoint)
     dispatch_status: {
       type: String,
-      enum: ["Pending", "Unassigned", "Assigned"],
+      enum: ["Pending", "Unassigned", "Processing", "Assigned"],
       default: "Unassigned",
     },
+    // Set while the logistics agent holds a dispatch claim on the document
+    claim_token: {
+      type: mongoose.Schema.Types.ObjectId,
+    },
+    claimed_at: {
+      type: Date,
+    },
+    // dispatch_status to restore if the claim is released undispatched
+    claimed_from: {
+      type: String,
+      enum: ["Pending", "Unassigned"],
+    },
     mission_id: {
       type: mongoose.Schema.Types.ObjectId,
     },
@@ -168,6 +180,14 @@ const reportSchema = new mongoose.Schema(
 reportSchema.index({ status: 1 });
 reportSchema.index({ timestamp: -1 });
 reportSchema.index({ "location.lat": 1, "location.lng": 1 });
+// Logistics agent dispatch query (analyzed, undispatched, by severity)
+reportSchema.index({ status: 1, dispatch_status: 1, "oracleData.severity": -1 });
+// Sentinel agent claim query (oldest pending first); partial so only the
+// Pending backlog is indexed rather than every report ever filed
+reportSchema.index(
+  { status: 1, createdAt: 1 },
+  { partialFilterExpression: { status: "Pending" } },
+);
 
 const Report = mongoose.model("Report", reportSchema);
 
@@ -1,9 +1,10 @@
 import mongoose from "mongoose";
 import axios from "axios";
+import config from "../config/index.js";
 import { logger } from "../utils/appLogger.js";
 
 // OSRM API Configuration
-const OSRM_BASE_URL = "https://router.project-osrm.org";
+const OSRM_BASE_URL = config.osrm.baseUrl;
 const OSRM_TIMEOUT = 10000;
 
 // Reroute radius in meters
@@ -1,8 +1,9 @@
 import axios from "axios";
+import config from "../config/index.js";
 import { logger } from "../utils/appLogger.js";
 
 // OSRM API Configuration
-const OSRM_BASE_URL = "https://router.project-osrm.org";
+const OSRM_BASE_URL = config.osrm.baseUrl;
 const OSRM_TIMEOUT = 10000; // 10 seconds timeout
 
 // Simple in-memory cache for routes